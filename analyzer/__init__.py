@@ -0,0 +1,21 @@
+"""
+Static code analyzer shared by the Flask and Streamlit front ends.
+
+Importing the package has no side effects (no logging configuration, no
+regex compilation); language tables are built lazily on first use.
+"""
+from .lexer import C_KEYWORDS, CPP_KEYWORDS, lex_file, lexical_analysis, token_summary
+from .c_scopes import build_c_scope_tree
+from .edits import apply_edits, line_edits
+from .issues import (
+    LINT, RUNTIME, SEMANTIC, SYNTAX, Issue, group_issues, issues_to_dicts,
+)
+from .line_metrics import line_metrics
+from .rules import RuleSet, load_rules, rule_set
+from .c_analysis import analyze_code, analyze_code_cpp, refactor_code, refactor_code_cpp
+from .python_analysis import (
+    analyze_code_python, refactor_code_python, remove_comments, to_snake_case, wrap_comment,
+)
+from .symbols import semantic_analysis_symbol_table
+from .pipeline import FIELDS, Analysis, analyze, parse_fields, parse_workers
+from .instance import Analyzer
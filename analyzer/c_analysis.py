@@ -0,0 +1,138 @@
+from .c_scopes import build_c_scope_tree
+from .edits import line_edits
+
+def analyze_code(code, workers=None, tree=None, rules=None):
+    """
+    Analyzes C code for simple bugs and dead code.
+    Returns a list of Issue records (see issues.py).
+    workers > 1 analyzes large files in parallel chunks split at top-level braces.
+    tree is an already built scope tree of the code (see build_c_scope_tree).
+    rules selects the enabled rules (see analyzer.rules); the checks
+    themselves live in analyzer/rules/c.py.
+    """
+    if workers and workers > 1:
+        from . import parallel
+        return parallel.analyze_parallel(code, "C", workers, rules)
+
+    from .rules import compile_pipeline
+    return compile_pipeline("C", rules)(code, tree)
+
+def refactor_code(code, edits=False, tree=None):
+    """
+    Refactors C code:
+    1. Expands single-line multiple statements (e.g. 'int x; int y;' -> 2 lines).
+    2. Removes dead code (lines after return).
+    3. Fixes indentation (Auto-formatting).
+    edits=True returns (refactored code, edit list) where the edit list holds
+    the line-range changes against the input (see edits.line_edits).
+    tree is an already built scope tree of the code (see build_c_scope_tree);
+    the indentation and the dead code both come from it.
+    """
+    if tree is None:
+        tree = build_c_scope_tree(code)
+    lines = code.split('\n')
+
+    # We want to split ';' but protect 'for' loops
+    # Heuristic: if 'for' in line, don't touch it to avoid breaking loop headers
+    def expanded(line_num):
+        line = lines[line_num - 1]
+        return ';' in line and 'for' not in line
+
+    # Dead code: the statements after a return up to the end of its block,
+    # each piece of an expanded line being a statement of its own
+    dead = {(line_num, statement) for _, line_num, statement, _, _ in tree.unreachable_statements(expanded)}
+    dead_lines = {line_num for line_num, _ in dead}
+    depth, closes = tree.depth, tree.closes
+    masked_lines = None
+    new_lines = []
+    rewritten = [] # (input line index, text, reasons) for the edit list
+    removed = {}
+
+    for k, line in enumerate(lines):
+        line_num = k + 1
+        stripped = line.strip()
+        # Indentation: the brace depth, one less for a line starting with '}'
+        level = depth[line_num] - 1 if line_num in closes else depth[line_num]
+
+        # If it's a for loop or doesn't have multiple statements, keep it
+        if 'for' in stripped or ';' not in stripped:
+            if line_num in dead_lines:
+                removed[k] = "Removed unreachable code"
+                continue
+            new_lines.append("    " * level + stripped if stripped else "") # Keep empty lines
+            if edits:
+                rewritten.append((k, new_lines[-1], ["Fixed indentation"]))
+            continue
+
+        # Split by semicolon, but keep the semicolon
+        # This handles 'int a; int b;' -> 'int a;\nint b;'
+        # We assume strings don't contain semicolons for this simple PBL
+        parts = stripped.split(';')
+        pieces = [] # (statement number, text), ignoring empty parts
+        for i, part in enumerate(parts):
+            clean_part = part.strip()
+            if clean_part:
+                pieces.append((i, clean_part + ';' if i < len(parts) - 1 else clean_part))
+        if not pieces:
+            removed[k] = "Removed empty statement"
+            continue
+        levels = None
+        if '{' in line or '}' in line:
+            if masked_lines is None:
+                from .patterns import compiled
+                masked_lines = tree.masked.split('\n')
+                leading = compiled('c_leading_token').match
+            levels = _piece_levels(masked_lines[k], depth[line_num], len(parts), leading)
+        for i, text in pieces:
+            if line_num in dead_lines and (line_num, i) in dead:
+                removed[k] = "Removed unreachable code"
+                continue
+            new_lines.append("    " * (level if levels is None else levels[i]) + text)
+            if edits:
+                if len(pieces) > 1:
+                    reasons = ["Split multiple statements onto separate lines"]
+                elif text == stripped:
+                    reasons = ["Fixed indentation"]
+                else:
+                    reasons = ["Reformatted statement"]
+                rewritten.append((k, new_lines[-1], reasons))
+
+    refactored = '\n'.join(new_lines)
+    if edits:
+        return refactored, line_edits(lines, rewritten, removed)
+    return refactored
+
+
+def _piece_levels(masked_line, depth, count, leading):
+    # Indentation level of each ';'-separated piece of a line: the brace
+    # depth before it, one less when it starts with '}'
+    levels = []
+    for part in masked_line.split(';'):
+        if '}' in part:
+            token = leading(part)
+            levels.append(max(0, depth - 1) if token and token.group(1) else depth)
+            depth = max(0, depth + part.count('{') - part.count('}'))
+        else:
+            levels.append(depth)
+            depth += part.count('{')
+    # A ';' in a string or comment makes one more piece in the line
+    levels.extend([depth] * (count - len(levels)))
+    return levels
+
+
+def analyze_code_cpp(code, workers=None, tree=None, rules=None):
+    """
+    Analyzes C++ code. Reuses C logic for now but checks for C++ specific keywords.
+    """
+    if workers and workers > 1:
+        from . import parallel
+        return parallel.analyze_parallel(code, "C++", workers, rules)
+
+    from .rules import compile_pipeline
+    return compile_pipeline("C++", rules)(code, tree)
+
+def refactor_code_cpp(code, edits=False, tree=None):
+    """
+    Refactors C++ code. Use C refactoring for now.
+    """
+    return refactor_code(code, edits=edits, tree=tree)
@@ -0,0 +1,126 @@
+"""
+Project mode for C/C++: resolves #include directives across files.
+
+A translation unit's symbol table is extended with the declarations of the
+local headers it includes, directly or transitively. '#include "..."' is
+searched in the including file's directory and then in the configured
+include directories, '#include <...>' in the include directories only
+(system headers are not scanned). Each header is read and parsed once per
+project and cached by path and mtime, so translation units that share
+headers share their parsed symbols.
+"""
+import os
+
+from .files import read_source
+from .patterns import compiled
+
+
+class Header:
+    """
+    Parsed header: its own symbols (tagged with 'file') and the resolved
+    paths of the headers it includes.
+    """
+    __slots__ = ('path', 'symbols', 'includes', 'unresolved')
+
+    def __init__(self, path, symbols, includes, unresolved):
+        self.path = path
+        self.symbols = symbols
+        self.includes = includes
+        self.unresolved = unresolved
+
+
+class CProject:
+    """
+    Include resolution and parsed-header cache shared by the translation
+    units of one run.
+    """
+    def __init__(self, include_dirs=(), language="C"):
+        self.include_dirs = [os.path.abspath(d) for d in include_dirs]
+        self.language = language
+        self._headers = {}   # absolute path -> (mtime_ns, size, Header)
+        self.parsed = 0      # headers actually parsed (cache misses)
+
+    def resolve(self, name, quoted, directory):
+        """
+        Absolute path of an included file, or None if it is not found.
+        """
+        search = ([directory] if quoted else []) + self.include_dirs
+        for base in search:
+            candidate = os.path.normpath(os.path.join(base, name))
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def includes(self, code, directory):
+        """
+        Returns ([resolved include paths], [unresolved include names]) of a source.
+        """
+        resolved, unresolved = [], []
+        for match in compiled('c_include').finditer(code):
+            name = match.group(2).strip()
+            path = self.resolve(name, match.group(1) == '"', directory)
+            if path is None:
+                unresolved.append(name)
+            else:
+                resolved.append(path)
+        return resolved, unresolved
+
+    def header(self, path):
+        """
+        Parsed Header of a file, from the cache unless it changed on disk.
+        """
+        st = os.stat(path)
+        cached = self._headers.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+
+        from .symbols import semantic_analysis_symbol_table
+        code = read_source(path)
+        symbols = semantic_analysis_symbol_table(code, self.language)
+        for symbol in symbols:
+            symbol['file'] = path
+        includes, unresolved = self.includes(code, os.path.dirname(path))
+        header = Header(path, symbols, includes, unresolved)
+        self._headers[path] = (st.st_mtime_ns, st.st_size, header)
+        self.parsed += 1
+        return header
+
+    def included_headers(self, code, directory):
+        """
+        Headers included by a source, transitively, in first-inclusion order
+        (each header once, so include cycles and repeated includes are fine).
+        """
+        pending, _ = self.includes(code, directory)
+        pending.reverse()
+        seen = set()
+        headers = []
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                header = self.header(path)
+            except OSError: # removed since it was resolved
+                continue
+            headers.append(header)
+            pending.extend(reversed(header.includes))
+        return headers
+
+    def symbol_table(self, code, directory='.', tree=None):
+        """
+        Symbol table of a translation unit followed by the symbols of the
+        headers it includes (those carry a 'file' key). Header symbol dicts
+        are shared between translation units and must not be modified.
+        """
+        from .symbols import semantic_analysis_symbol_table
+        symbols = semantic_analysis_symbol_table(code, self.language, tree=tree)
+        for header in self.included_headers(code, directory):
+            symbols.extend(header.symbols)
+        return symbols
+
+    def symbol_table_file(self, path):
+        """
+        symbol_table() of a source file on disk.
+        """
+        return self.symbol_table(read_source(path), os.path.dirname(os.path.abspath(path)))
@@ -0,0 +1,449 @@
+"""
+C/C++ brace-scope tree.
+
+Comments, strings and directives are masked out of the file first, then one
+pass over the braces left records every function, struct/class/union/enum,
+namespace and block range. The tree is built once per file and shared by
+dead-code detection, the symbol table and the reformatter instead of each
+of them counting braces per line.
+"""
+from .patterns import compiled
+
+CONTROL_KEYWORDS = {'if', 'else', 'for', 'while', 'do', 'switch', 'try', 'catch'}
+AGGREGATE_KEYWORDS = {'struct', 'union', 'enum', 'class'}
+LABEL_KEYWORDS = {'case', 'default', 'public', 'private', 'protected'}
+
+# Headers starting with one of these are checked for a control keyword
+CONTROL_PREFIXES = tuple(CONTROL_KEYWORDS)
+
+# Scopes whose direct children can be functions, structs or namespaces
+OUTER_KINDS = ('file', 'namespace', 'struct')
+
+# Comments and directives are masked to this whitespace character rather
+# than a space: it still counts as a token when finding a line's first token
+PLACEHOLDER = '\x1f'
+
+
+class CScope:
+    """
+    A brace-delimited range: 'file', 'function', 'struct', 'namespace' or 'block'.
+    """
+    __slots__ = ('kind', 'name', 'line', 'start_line', 'end_line', 'depth', 'parent', 'children', 'header')
+
+    def __init__(self, kind, name, line, start_line, parent=None, header=None):
+        if header is None:
+            self.kind = kind
+            self.name = name
+            self.line = line          # first line of the header
+        self.header = header          # (masked code, statement search start, brace offset) until classified
+        self.start_line = start_line  # line of the opening brace
+        self.end_line = None          # line of the closing brace
+        self.depth = 0                # brace depth inside the scope
+        self.parent = parent
+        self.children = []
+        if parent is not None:
+            self.depth = parent.depth + 1
+            parent.children.append(self)
+
+    def __getattr__(self, attr):
+        # The header of a nested block is only read when its name or line
+        # (or its kind, when it names a struct or namespace) is used
+        if self.header is None or attr not in ('kind', 'name', 'line'):
+            raise AttributeError(attr)
+        _classify(self)
+        return getattr(self, attr)
+
+    def named(self):
+        """
+        Returns the innermost enclosing function/struct/namespace (or the file).
+        """
+        scope = self
+        while scope.kind == 'block':
+            scope = scope.parent
+        return scope
+
+    def __repr__(self):
+        return f"CScope({self.kind}, {self.name!r}, {self.start_line}-{self.end_line})"
+
+
+class CScopeTree:
+    """
+    Scope ranges of one file plus per-line structure (1-based line numbers).
+    The per-line structure is worked out the first time it is used.
+    """
+    def __init__(self, line_count, masked):
+        self.root = CScope('file', 'global', 1, 1)
+        self.root.end_line = line_count
+        self.scopes = [self.root]   # in order of their opening braces
+        self.masked = masked        # the code with comments, directives and strings masked (see _mask)
+        self.line_count = line_count
+        self.return_words = []      # (offset, innermost scope) of every 'return' word
+        self._depth = self._starts = None
+        self._closes = self._returns = None
+
+    @property
+    def depth(self):
+        """
+        Brace depth at the start of each line, filled scope by scope: a
+        scope covers the lines after its opening brace up to its closing
+        brace, and its children are filled after it.
+        """
+        if self._depth is None:
+            depth = [0] * (self.line_count + 2)
+            for scope in self.scopes[1:]:
+                count = scope.end_line - scope.start_line
+                if count > 0:
+                    depth[scope.start_line + 1:scope.end_line + 1] = [scope.depth] * count
+            self._depth = depth
+        return self._depth
+
+    @property
+    def closes(self):
+        """
+        Lines whose first token is '}'.
+        """
+        if self._closes is None:
+            self._closes = set()
+            line = 1
+            pos = 0
+            # The newline in front of the first line is added here
+            text = '\n' + self.masked
+            for match in compiled('c_close_lines').finditer(text):
+                line += text.count('\n', pos, match.start())
+                pos = match.start()
+                self._closes.add(line)
+        return self._closes
+
+    @property
+    def returns(self):
+        """
+        ((line, offset) of the ';' ending a 'return' statement, its scope) for
+        the returns in functions. A 'return' only starts a statement after
+        ';', a brace, a label or at the start of the file, and a statement
+        runs on over the braces of a value ('return (T){...};').
+        """
+        if self._returns is None:
+            self._returns = []
+            masked = self.masked
+            plain = compiled('c_plain_statement').match
+            stop = compiled('c_statement_end').search
+            line = 1
+            pos = 0
+            for offset, scope in self.return_words:
+                if offset and (masked[offset - 1].isalnum() or masked[offset - 1] == '_'):
+                    continue
+                before = masked[max(0, offset - 80):offset].rstrip()
+                while not before and offset > 80 and len(before) < offset:
+                    before = masked[:offset].rstrip()
+                if before and before[-1] not in ';{}:':
+                    continue
+                if before and before[-1] == ':':
+                    # Only labels may stand between the statement start and the 'return'
+                    start = max(masked.rfind(';', 0, offset), masked.rfind('{', 0, offset), masked.rfind('}', 0, offset)) + 1
+                    if compiled('c_statement_labels').match(masked, start, offset).end() != offset:
+                        continue
+                if scope.named().kind != 'function':
+                    continue
+                match = plain(masked, offset)
+                end = match.end() - 1 if match else _statement_end(masked, offset, stop)
+                if end is not None:
+                    line += masked.count('\n', pos, end) if end >= pos else -masked.count('\n', end, pos)
+                    pos = end
+                    self._returns.append(((line, end), scope))
+        return self._returns
+
+    def scope_at(self, line):
+        """
+        Innermost scope open at the start of a line.
+        """
+        if self._starts is None:
+            from bisect import bisect_left
+            # The file starts before its first line
+            self._starts = ([0] + [scope.start_line for scope in self.scopes[1:]], bisect_left)
+        starts, bisect_left = self._starts
+        # The last scope opened on an earlier line, or the nearest of its
+        # parents still open
+        scope = self.scopes[bisect_left(starts, line) - 1]
+        while scope.end_line < line:
+            scope = scope.parent
+        return scope
+
+    def scope_name_at(self, line):
+        """
+        Name of the innermost function/struct/namespace at a line, 'global' at file level.
+        """
+        return self.scope_at(line).named().name
+
+    def indent_level(self, line):
+        """
+        Indentation level of a line: its brace depth, one less when it starts with '}'.
+        """
+        return max(0, self.depth[line] - (1 if line in self.closes else 0))
+
+    def functions(self):
+        """
+        Function scopes in source order.
+        """
+        return [scope for scope in self.scopes if scope.kind == 'function']
+
+    def unreachable_statements(self, split=None):
+        """
+        Yields (return line, line, statement, start, end) for the statements
+        that follow a 'return' up to the end of its block, stopping before
+        the closing brace or a case label of the same block. A line is one
+        statement, unless split(line) is true: then it is cut after every
+        ';' and statement numbers its pieces. start:end is the statement's
+        span in the masked code.
+        """
+        masked = self.masked
+        size = len(masked)
+        leading = compiled('c_leading_token').match
+        for (ret_line, end), _ in self.returns:
+            line = ret_line
+            cut = split is not None and split(line)
+            # The rest of the return's line belongs to it unless the line is cut
+            statement = masked.count(';', masked.rfind('\n', 0, end) + 1, end) + 1 if cut else 0
+            start = end + 1
+            own = not cut
+            depth = 0   # braces opened since the 'return'
+            eol = masked.find('\n', start)
+            while True:
+                stop = size if eol == -1 else eol
+                semi = masked.find(';', start, stop) if cut else -1
+                if semi != -1:
+                    stop = semi + 1
+                closes = masked.count('}', start, stop)
+                opens = masked.count('{', start, stop)
+                # The block closes in this statement (or the file ends)
+                closing = stop == size or (closes > depth and (not opens or _drops(masked, start, stop, depth)))
+                # An empty piece after a ';' is no statement
+                if not own and (start < stop or not statement):
+                    token = leading(masked, start, stop)
+                    if token is not None:
+                        if token.group(1) and closing:
+                            break
+                        if not token.group(1) and depth == 0:
+                            break
+                    yield ret_line, line, statement, start, stop
+                if closing:
+                    break
+                own = False
+                depth += opens - closes
+                if semi != -1:
+                    statement += 1
+                    start = stop
+                else:
+                    line += 1
+                    cut = split is not None and split(line)
+                    statement = 0
+                    start = stop + 1
+                    eol = masked.find('\n', start)
+
+    def unreachable_lines(self):
+        """
+        Returns {line: return line} for the code lines (lines with a token
+        outside comments and directives) that follow a return in its block.
+        """
+        dead = {}
+        masked = self.masked
+        for ret_line, line, _, start, end in self.unreachable_statements():
+            if start < end and not masked[start:end].isspace():
+                dead.setdefault(line, ret_line)
+        return dead
+
+
+def _mask(code):
+    # Returns (masked code, lines starting inside a comment/directive): comments
+    # and preprocessor directives become PLACEHOLDER and strings/character
+    # literals an empty '"', keeping every newline, so the braces, ';' and
+    # words left are all code
+    spans = compiled('c_spans').search
+    pieces = []
+    continued = set()
+    line = 1
+    counted = 0     # offset up to which newlines are counted into line
+    last = 0
+    pos = 0
+    while True:
+        match = spans(code, pos)
+        if match is None:
+            break
+        start, end = match.span()
+        char = code[start]
+        if char == '#' and code[code.rfind('\n', 0, start) + 1:start].strip(' \t'):
+            pos = start + 1 # a '#' after other tokens is not a directive
+            continue
+        pieces.append(code[last:start])
+        if char == '"' or char == "'":
+            pieces.append('"')
+        else:
+            spanned = code.count('\n', start, end)
+            if spanned:
+                line += code.count('\n', counted, start)
+                counted = start
+                continued.update(range(line + 1, line + spanned + 1))
+            pieces.append(PLACEHOLDER + '\n' * spanned)
+        last = pos = end
+    pieces.append(code[last:])
+    return ''.join(pieces), continued
+
+
+def _classify(scope):
+    # Decides what kind of scope a '{' opens from its header: the statement
+    # before it, after the last ';' outside parentheses and any labels
+    masked, start, end = scope.header
+    scope.header = None
+    semi = masked.rfind(';', start, end)
+    while semi != -1 and masked.count(')', semi, end) > masked.count('(', semi, end):
+        semi = masked.rfind(';', start, semi)
+    if semi != -1:
+        start = semi + 1
+    if masked.find(':', start, end) != -1:
+        start = compiled('c_statement_labels').match(masked, start, end).end()
+    header = masked[start:end].lstrip()
+    if not header:
+        scope.kind, scope.name, scope.line = 'block', '', scope.start_line
+        return
+    scope.line = scope.start_line - masked.count('\n', end - len(header), end)
+    scope.kind, scope.name = _header_kind(header, scope.parent)
+
+
+def _header_kind(header, parent):
+    # (kind, name) of the scope opened after a (left-stripped) header
+    paren = header.find('(')
+    if paren == -1 and '=' not in header and compiled('c_scope_words').search(header):
+        words = compiled('c_word').findall(header)
+        for i, word in enumerate(words):
+            if word in AGGREGATE_KEYWORDS:
+                return 'struct', words[i + 1] if i + 1 < len(words) else '<anonymous>'
+            if word == 'namespace':
+                return 'namespace', words[i + 1] if i + 1 < len(words) else '<anonymous>'
+    if header.startswith(CONTROL_PREFIXES):
+        first = compiled('c_token').match(header).group()
+        if first in CONTROL_KEYWORDS:
+            return 'block', first
+    if paren != -1 and parent.kind in OUTER_KINDS:
+        # The last word before the '(': most often the last of the words
+        # split at whitespace
+        name = header[:paren].rsplit(None, 1)[-1] if paren else ''
+        if name.isascii() and name.isidentifier():
+            return 'function', name
+        names = compiled('c_word').findall(header, 0, paren)
+        if names:
+            return 'function', names[-1]
+    return 'block', ''
+
+
+def _statement_end(masked, start, stop):
+    # Offset of the ';' ending the statement at start, or None when its
+    # block closes first; braced values inside it are skipped
+    nested = 0
+    pos = start
+    while True:
+        match = stop(masked, pos)
+        if match is None:
+            return None
+        pos = match.end()
+        char = masked[pos - 1]
+        if char == '{':
+            nested += 1
+        elif char == '}':
+            if not nested:
+                return None
+            nested -= 1
+        elif not nested and masked.count('(', start, pos) <= masked.count(')', start, pos):
+            return pos - 1
+
+
+def _drops(masked, start, stop, depth):
+    # Whether the braces in masked[start:stop] close more blocks than depth
+    for match in compiled('c_braces').finditer(masked, start, stop):
+        depth += 1 if masked[match.start()] == '{' else -1
+        if depth < 0:
+            return True
+    return False
+
+
+def build_c_scope_tree(code):
+    """
+    Builds the scope tree for C/C++ code. Braces inside strings, character
+    literals, comments and preprocessor lines are ignored. A scope is
+    classified from its header when its '{' opens at file level or in a
+    struct or namespace; the header of a nested block is only read when its
+    name or line is used.
+    """
+    line_count = code.count('\n') + 1
+    masked = _mask(code)[0]
+    tree = CScopeTree(line_count, masked)
+    scopes, root = tree.scopes, tree.root
+    scope_words = compiled('c_scope_words').search
+    current = root
+    line = 1
+    pos = 0
+    segment = 0     # offset after the last brace: a header starts there at the earliest
+
+    # Each 'return' word is paired with the scope open at it as the braces go by
+    words = [match.start() for match in compiled('c_return').finditer(masked)]
+    words.append(len(masked))
+    next_word = words[0]
+    count = 0
+
+    for match in compiled('c_braces').finditer(masked):
+        start = match.start()
+        while next_word < start:
+            tree.return_words.append((next_word, current))
+            count += 1
+            next_word = words[count]
+        line += masked.count('\n', pos, start)
+        pos = start
+        if masked[start] == '{':
+            parent = current
+            current = CScope(None, None, None, line, parent, (masked, segment, start))
+            if parent.kind in OUTER_KINDS:
+                _classify(current)
+            elif not scope_words(masked, segment, start):
+                current.kind = 'block'
+            scopes.append(current)
+        elif current is not root:
+            current.end_line = line
+            current = current.parent
+        segment = start + 1
+    tree.return_words.extend((offset, current) for offset in words[count:-1])
+
+    # Scopes left open by unbalanced braces
+    for scope in scopes:
+        if scope.end_line is None:
+            scope.end_line = line_count
+    return tree
+
+
+def top_level_boundaries(code):
+    """
+    1-based lines where a new top-level statement can start: at brace depth
+    0, right after a top-level scope closes, and not inside a comment/string.
+    Only the braces left in the masked code are counted, line by line (no
+    scope is built or classified), so a file can be split cheaply.
+    """
+    masked, continued = _mask(code)
+    boundaries = []
+    depth = 0
+    closed = False  # a top-level scope closed on the previous line
+    for line, text in enumerate(masked.split('\n'), 1):
+        if closed and not depth and line not in continued:
+            boundaries.append(line)
+        closed = False
+        if '}' not in text:
+            depth += text.count('{')
+        elif '{' not in text:
+            # A '}' at depth 0 closes nothing
+            closes = text.count('}')
+            closed = 0 < depth <= closes
+            depth = max(0, depth - closes)
+        else:
+            for brace in compiled('c_braces').findall(text):
+                if brace == '{':
+                    depth += 1
+                elif depth:
+                    depth -= 1
+                    closed = closed or not depth
+    return boundaries
@@ -0,0 +1,191 @@
+"""
+Command line interface: python -m analyzer <command> ...
+
+    check PATH...     analyze files/directories and print their issues
+    watch ROOT        poll ROOT and print issue deltas as files change
+    diff BASE [HEAD]  print the issues on lines changed since BASE
+    symbols PATH...   print symbol tables (C/C++: with included headers, -I DIR)
+    index ROOT        update the project-wide Python symbol index and query it
+"""
+import argparse
+import json
+import sys
+
+
+def _print_issues(path, issues, prefix='', as_json=False):
+    from .files import format_issue
+    for issue in issues:
+        if as_json:
+            print(json.dumps(dict(issue.to_dict(), path=path)))
+        else:
+            print(prefix + format_issue(path, issue))
+
+
+def cmd_check(args):
+    from .files import analyze_file, iter_source_files
+    total = 0
+    for root in args.paths:
+        for path in iter_source_files(root):
+            issues = analyze_file(path, args.engine, args.rules)
+            _print_issues(path, issues, as_json=args.json)
+            total += len(issues)
+    return 1 if total else 0
+
+
+def cmd_watch(args):
+    from .watch import Watcher
+    watcher = Watcher(args.root, workers=args.workers, engine=args.engine, rules=args.rules)
+    initial = watcher.poll()
+    if not args.json:
+        count = sum(len(issues) for issues in watcher.issues.values())
+        print(f"Watching {args.root}: {len(watcher.files)} files, {count} issues", flush=True)
+    if args.initial:
+        for delta in initial:
+            _print_issues(delta.path, delta.added, '+ ', args.json)
+
+    def report(deltas):
+        for delta in deltas:
+            if args.json:
+                print(json.dumps(delta.to_dict()))
+                continue
+            if delta.removed_file:
+                print(f"x {delta.path} (removed)")
+            _print_issues(delta.path, delta.added, '+ ')
+            _print_issues(delta.path, delta.resolved, '- ')
+        sys.stdout.flush()
+
+    try:
+        watcher.watch(args.interval, report)
+    except KeyboardInterrupt:
+        return 0
+
+
+def cmd_diff(args):
+    from .git_diff import GitError, analyze_diff
+    try:
+        results = analyze_diff(args.base, args.head, args.repo, args.engine, args.workers, args.rules)
+    except GitError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    for path, issues in results:
+        _print_issues(path, issues, as_json=args.json)
+    return 1 if any(issues for _, issues in results) else 0
+
+
+def cmd_symbols(args):
+    from .c_project import CProject
+    from .files import iter_source_files, language_for, read_source
+    from .symbols import semantic_analysis_symbol_table
+    project = CProject(args.include_dir)
+    for root in args.paths:
+        for path in iter_source_files(root):
+            language = language_for(path)
+            if language == "Python":
+                symbols = semantic_analysis_symbol_table(read_source(path), language)
+            else:
+                symbols = project.symbol_table_file(path)
+            for symbol in symbols:
+                if args.json:
+                    print(json.dumps(dict(symbol, path=path)))
+                else:
+                    # Header symbols are located in their header
+                    where, via = (symbol['file'], f" [via {path}]") if 'file' in symbol else (path, "")
+                    print(f"{where}:{symbol['line']}: {symbol['name']} {symbol['type']} in {symbol['scope']}{via}")
+    return 0
+
+
+def cmd_index(args):
+    import time
+    from .py_index import build_index
+    start = time.perf_counter()
+    index, updated, removed = build_index(args.root, args.index, args.workers)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not args.json:
+        print(f"Indexed {index.file_count()} files ({len(updated)} updated, {len(removed)} removed) in {elapsed:.0f} ms",
+              file=sys.stderr)
+
+    for name in args.who_uses:
+        for path, line, reference in index.who_uses(name):
+            if args.json:
+                print(json.dumps({'name': name, 'path': path, 'line': line, 'reference': reference}))
+            else:
+                print(f"{path}:{line}: {reference}")
+    if args.dead:
+        kinds = set(args.kind.split(',')) if args.kind else None
+        for qualname, kind, path, line in index.dead(kinds):
+            if args.json:
+                print(json.dumps({'name': qualname, 'kind': kind, 'path': path, 'line': line}))
+            else:
+                print(f"{path}:{line}: unused {kind} '{qualname}'")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m analyzer', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help='analyze files and print their issues')
+    check.add_argument('paths', nargs='+')
+    check.set_defaults(func=cmd_check)
+
+    watch = commands.add_parser('watch', help='re-analyze files as they change')
+    watch.add_argument('root')
+    watch.add_argument('--interval', type=float, default=0.5, help='seconds between polls')
+    watch.add_argument('--workers', type=int, default=None, help='analysis processes (default: CPU count)')
+    watch.add_argument('--initial', action='store_true', help='also print the issues found at startup')
+    watch.set_defaults(func=cmd_watch)
+
+    diff = commands.add_parser('diff', help='analyze the files changed since a git revision')
+    diff.add_argument('base', help='base revision, e.g. origin/main')
+    diff.add_argument('head', nargs='?', default=None, help='head revision (default: the working tree)')
+    diff.add_argument('--repo', default='.', help='path inside the git repository')
+    diff.add_argument('--workers', type=int, default=None, help='analysis processes (default: CPU count)')
+    diff.set_defaults(func=cmd_diff)
+
+    symbols = commands.add_parser('symbols', help='print symbol tables, resolving C/C++ includes')
+    symbols.add_argument('paths', nargs='+')
+    symbols.add_argument('-I', '--include-dir', action='append', default=[],
+                         help='directory searched for #include files (repeatable)')
+    symbols.set_defaults(func=cmd_symbols)
+
+    index = commands.add_parser('index', help='project-wide Python symbol index (who uses X, what is dead)')
+    index.add_argument('root')
+    index.add_argument('--who-uses', action='append', default=[], metavar='NAME',
+                       help='print the uses of a qualified name, e.g. pkg.module.func (repeatable)')
+    index.add_argument('--dead', action='store_true', help='print definitions nothing references')
+    index.add_argument('--kind', help='with --dead: comma-separated kinds (module,class,function,method)')
+    index.add_argument('--index', default=None, help='index database (default: ROOT/.analyzer_index.db)')
+    index.add_argument('--workers', type=int, default=None, help='parsing processes on large updates')
+    index.add_argument('--json', action='store_true', help='print JSON lines')
+    index.set_defaults(func=cmd_index)
+
+    for command in (check, watch, diff, symbols):
+        command.add_argument('--engine', choices=('lines', 'ast'), default='lines',
+                             help="Python engine ('ast' parses once, falls back to 'lines')")
+        command.add_argument('--json', action='store_true', help='print JSON lines')
+    for command in (check, watch, diff):
+        command.add_argument('--config', help='JSON rule configuration ({"disable": [...], "options": {...}})')
+        command.add_argument('--disable', action='append', default=[], metavar='RULE',
+                             help='disable a rule, e.g. py-missing-docstring (repeatable)')
+    return parser
+
+
+def _rules(args):
+    # Rule selection from --config and --disable
+    from .rules import RuleSet, load_rules
+    rules = load_rules(args.config) if args.config else RuleSet()
+    if args.disable:
+        rules = RuleSet(rules.enable, rules.disable | set(args.disable), rules.options)
+    return rules
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if hasattr(args, 'config'):
+        try:
+            args.rules = _rules(args)
+        except (OSError, ValueError) as e:
+            parser.error(f"invalid rule configuration: {e}")
+    return args.func(args)
@@ -0,0 +1,96 @@
+"""
+Line-range edit lists for the refactoring passes.
+
+The refactorers record, for every output line, the original line it came
+from (None for inserted lines) and the reasons it was changed. line_edits()
+turns that provenance into a minimal list of edits against the original
+text, so a client can patch its copy instead of receiving the whole file.
+"""
+
+
+def _edit(start, end, lines, reasons):
+    # start/end: half-open range of 0-based original line indices
+    if not lines:
+        op = 'delete'
+    elif start == end:
+        op = 'insert'
+    else:
+        op = 'replace'
+    return {
+        'op': op,
+        'start': start + 1,   # first original line replaced (1-based)
+        'end': end,           # last original line replaced; start - 1 for inserts
+        'lines': lines,
+        'reasons': reasons,
+    }
+
+
+def line_edits(original_lines, rewritten, removed=None):
+    """
+    Builds the edit list for a rewrite.
+    rewritten: (origin, text, reasons) for each output entry in order, origin
+    being the 0-based index of the original line it was produced from, or
+    None for inserted lines. text may span several lines.
+    removed: {origin: reason} for original lines the rewrite dropped.
+    Edits are sorted and non-overlapping; applying each one as
+    lines[start - 1:end] = edit['lines'] from the last to the first
+    reproduces the rewritten text.
+    """
+    removed = removed or {}
+    edits = []
+    hunk = None       # [start, end, lines, reasons]
+    position = 0      # next original line not yet consumed
+
+    def add_reasons(reasons):
+        for reason in reasons:
+            if reason not in hunk[3]:
+                hunk[3].append(reason)
+
+    def skip_to(origin):
+        # Original lines between the last consumed one and origin were removed
+        hunk[1] = origin
+        for skipped in range(position, origin):
+            add_reasons([removed.get(skipped, "Removed line")])
+
+    for origin, text, reasons in rewritten:
+        if origin is not None and origin >= position:
+            if origin > position:
+                if hunk is None:
+                    hunk = [position, position, [], []]
+                skip_to(origin)
+            position = origin + 1
+            if text == original_lines[origin]:
+                # Unchanged line: closes the current hunk
+                if hunk is not None:
+                    edits.append(_edit(*hunk))
+                    hunk = None
+                continue
+            if hunk is None:
+                hunk = [origin, origin, [], []]
+            hunk[1] = position
+        elif hunk is None:
+            # Inserted line (or extra output of an already consumed line)
+            hunk = [position, position, [], []]
+        hunk[2].extend(text.split('\n'))
+        add_reasons(reasons)
+        if origin in removed:
+            # Part of the line survived, part of it was removed
+            add_reasons([removed[origin]])
+
+    if position < len(original_lines):
+        if hunk is None:
+            hunk = [position, position, [], []]
+        skip_to(len(original_lines))
+    if hunk is not None:
+        edits.append(_edit(*hunk))
+    return edits
+
+
+def apply_edits(original_lines, edits):
+    """
+    Applies an edit list to the original lines and returns the new lines.
+    """
+    lines = list(original_lines)
+    for edit in reversed(edits):
+        lines[edit['start'] - 1:edit['end']] = edit['lines']
+    return lines
@@ -0,0 +1,69 @@
+"""
+Analysis of source files on disk (used by the command line modes).
+"""
+import os
+
+LANGUAGE_BY_EXTENSION = {
+    '.py': "Python",
+    '.c': "C", '.h': "C",
+    '.cpp': "C++", '.cc': "C++", '.cxx': "C++", '.hpp': "C++", '.hh': "C++", '.hxx': "C++",
+}
+
+# Directories never worth descending into
+SKIP_DIRS = {'__pycache__', 'node_modules', 'venv', 'env', 'build', 'dist'}
+
+
+def language_for(path):
+    """
+    Analyzer language of a file from its extension, or None if unsupported.
+    """
+    return LANGUAGE_BY_EXTENSION.get(os.path.splitext(path)[1].lower())
+
+
+def iter_source_files(root):
+    """
+    Yields the paths of the supported source files under root (or root itself
+    if it is a file), skipping hidden and build directories.
+    """
+    if os.path.isfile(root):
+        if language_for(root):
+            yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if language_for(name):
+                yield os.path.join(dirpath, name)
+
+
+def read_source(path):
+    """
+    Reads a source file as text with '\\n' line endings.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data.decode('utf-8', 'replace').replace('\r\n', '\n')
+
+
+def analyze_source(code, language, engine="lines", rules=None):
+    """
+    Issues of one source text (only the issue phase is run).
+    """
+    from .pipeline import analyze
+    return analyze(code, language, fields=('issues',), engine=engine, rules=rules)['issues']
+
+
+def analyze_file(path, engine="lines", rules=None):
+    """
+    Issues of one file. Runs in worker processes, so it only takes picklable
+    arguments and returns picklable results.
+    """
+    return analyze_source(read_source(path), language_for(path), engine, rules)
+
+
+def format_issue(path, issue):
+    """
+    One-line 'path:line:column: type: message' report of an issue.
+    """
+    column = f"{issue.column}:" if issue.column else ""
+    return f"{path}:{issue.line}:{column} {issue.type}: {issue.message} [{issue.rule}]"
@@ -0,0 +1,148 @@
+"""
+Changed-lines analysis of a git diff (for pull request checks).
+
+The files changed between two revisions are analyzed in full, so rules that
+need the whole file (unused imports, uninitialized variables, ...) see all
+of it, but only the issues on lines added or modified by the diff are
+reported. The cost scales with the size of the change, not of the repository.
+"""
+import os
+import subprocess
+
+from .files import analyze_source, language_for
+
+# Hunk headers read '@@ -old_start[,old_count] +new_start[,new_count] @@'
+HUNK_PREFIX = '@@ '
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(repo, *args):
+    result = subprocess.run(['git', '-C', repo, '-c', 'core.quotepath=off', *args],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise GitError(result.stderr.decode('utf-8', 'replace').strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def _unquote(path):
+    # git C-quotes paths with unusual characters: "dir/caf\303\251.py"
+    if not path.startswith('"'):
+        return path
+    import codecs
+    return codecs.escape_decode(path[1:-1].encode('utf-8'))[0].decode('utf-8', 'replace')
+
+
+def _hunk_range(header):
+    # '@@ -old_start[,old_count] +new_start[,new_count] @@' -> (old_count, new_start, new_count)
+    old, new = header.split(' ', 3)[1:3]
+    old_count = old.partition(',')[2]
+    start, _, count = new[1:].partition(',')
+    return int(old_count) if old_count else 1, int(start), int(count) if count else 1
+
+
+def parse_hunks(diff_text):
+    """
+    Parses 'git diff --unified=0' output into {path: [(start, end)]}, the
+    1-based inclusive line ranges added or modified in the new version of
+    each file. Deleted files and pure deletions contribute no ranges.
+
+    Each 'diff --git' header starts a file, whose path is taken from the
+    '+++' line that directly follows its '---' line. Hunk bodies are
+    skipped by their line counts, so added or removed lines that happen to
+    start with '++ ', '-- ' or '@@ ' are never read as headers.
+    """
+    changed = {}
+    ranges = None
+    old_left = new_left = 0   # lines of the current hunk not read yet
+    previous = ''
+    # Lines are split on '\n' only: source lines may contain other separators
+    for line in diff_text.split('\n'):
+        if old_left > 0 or new_left > 0:
+            tag = line[:1]
+            if tag == '+':
+                new_left -= 1
+                continue
+            if tag == '-':
+                old_left -= 1
+                continue
+            if tag == ' ':
+                old_left -= 1
+                new_left -= 1
+                continue
+            if tag == '\\':  # '\ No newline at end of file'
+                continue
+            old_left = new_left = 0  # truncated hunk
+        if line.startswith('diff --git '):
+            ranges = None
+        elif line.startswith('+++ ') and previous.startswith('--- '):
+            target = _unquote(line[4:].rstrip('\t'))
+            if target == '/dev/null':
+                ranges = None
+            else:
+                ranges = changed.setdefault(target[2:] if target.startswith('b/') else target, [])
+        elif line.startswith(HUNK_PREFIX):
+            old_left, start, new_left = _hunk_range(line)
+            if ranges is not None and new_left:
+                ranges.append((start, start + new_left - 1))
+        previous = line
+    return changed
+
+
+def changed_lines(base, head=None, repo='.'):
+    """
+    Returns {path relative to the repository root: [(start, end)]} for the
+    supported source files changed between base and head (the working tree
+    when head is None).
+    """
+    revisions = [base] if head is None else [base, head]
+    diff = _git(repo, 'diff', '--unified=0', '--no-color', '--no-ext-diff', '-M',
+                '--diff-filter=ACMR', *revisions, '--')
+    changed = parse_hunks(diff.decode('utf-8', 'replace'))
+    return {path: ranges for path, ranges in changed.items() if ranges and language_for(path)}
+
+
+def in_ranges(line, ranges):
+    """
+    Whether a line number falls in one of the sorted (start, end) ranges.
+    """
+    from bisect import bisect_right
+    i = bisect_right(ranges, (line, float('inf'))) - 1
+    return i >= 0 and ranges[i][0] <= line <= ranges[i][1]
+
+
+def read_revision(repo, path, head=None):
+    """
+    Text of a file at a revision (the working tree copy when head is None).
+    """
+    if head is None:
+        from .files import read_source
+        return read_source(os.path.join(repo, path))
+    data = _git(repo, 'show', f'{head}:{path}')
+    return data.decode('utf-8', 'replace').replace('\r\n', '\n')
+
+
+def _analyze(sources, engine, workers, rules):
+    # sources: [(code, language)], analyzed in the pool when there are several
+    if len(sources) < 2 or workers < 2:
+        return [analyze_source(code, language, engine, rules) for code, language in sources]
+    from .parallel import get_pool
+    codes, languages = zip(*sources)
+    count = len(sources)
+    return list(get_pool(workers).map(analyze_source, codes, languages, [engine] * count, [rules] * count))
+
+
+def analyze_diff(base, head=None, repo='.', engine="lines", workers=None, rules=None):
+    """
+    Analyzes the files changed between base and head and returns
+    [(path, issues on changed lines)], paths relative to the repository root.
+    """
+    root = _git(repo, 'rev-parse', '--show-toplevel').decode('utf-8').strip()
+    changed = changed_lines(base, head, root)
+    paths = sorted(changed)
+    sources = [(read_revision(root, path, head), language_for(path)) for path in paths]
+    results = _analyze(sources, engine, workers or os.cpu_count() or 1, rules)
+    return [(path, [issue for issue in issues if in_ranges(issue.line, changed[path])])
+            for path, issues in zip(paths, results)]
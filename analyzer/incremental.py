@@ -0,0 +1,136 @@
+"""
+Incremental Python refactoring.
+
+Steps 0-11 of refactor_code_python only look at the line being rewritten,
+the line after it and usage counts over the whole file. The file is split
+into top-level units (import blocks, functions, classes) and each unit's
+rewrite is cached by its text; a cached rewrite is reused as long as the
+usage counts it consulted still hold. Only the cross-cutting passes (rename
+map, empty blocks, logging import) run over the whole file every time, so a
+small edit costs one unit's rewrite plus those linear passes.
+"""
+from .python_analysis import _rewrite_lines, remove_comments, top_level_lines, usage_count, word_counts
+
+# Caches are cleared when they grow past this many entries
+MAX_CACHED_UNITS = 4096
+
+_clean_cache = {}     # unit text -> _CleanUnit
+_rewrite_cache = {}   # (unit text, followed by a docstring) -> (result, usage counts)
+
+
+class _CleanUnit:
+    """
+    Comment-free lines of a unit, its word counts and the usage counts of
+    the other (multi-word) names asked for so far.
+    """
+    __slots__ = ('lines', 'text', 'words', '_counts')
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.text = '\n'.join(lines)
+        self.words = word_counts(self.text)
+        self._counts = {}
+
+    def count(self, name):
+        value = self._counts.get(name)
+        if value is None:
+            value = self._counts[name] = usage_count(name, self.text)
+        return value
+
+
+def _is_unit_start(line, in_import_block):
+    # Column-0 lines that open a new unit
+    if line.startswith(('import ', 'from ')):
+        return not in_import_block
+    if line.startswith(('def ', 'async def ', 'class ', '@')):
+        return True
+    return in_import_block
+
+
+def split_units(lines):
+    """
+    Returns the [(start, end)] half-open line ranges of the top-level units.
+    A unit starts at a column-0 def/class (or its first decorator), at the
+    first line of a block of imports, or at the first statement after one.
+    """
+    units = []
+    start = 0
+    in_import_block = False
+    prev_decorator = False
+    for i, line in top_level_lines(lines):
+        if not prev_decorator and i > start and _is_unit_start(line, in_import_block):
+            units.append((start, i))
+            start = i
+        in_import_block = line.startswith(('import ', 'from '))
+        prev_decorator = line.startswith('@')
+    units.append((start, len(lines)))
+    return units
+
+
+def _cached(cache, key, value):
+    if len(cache) >= MAX_CACHED_UNITS:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
+def rewrite_units(original_lines):
+    """
+    Incremental equivalent of steps 0-11 of refactor_code_python: returns the
+    same (new lines, provenance, removed, renames) for the whole file, reusing
+    the rewrite of every unit whose text and consulted usage counts are
+    unchanged since an earlier call.
+    """
+    units = []
+    for start, end in split_units(original_lines):
+        text = '\n'.join(original_lines[start:end])
+        cleaned = _clean_cache.get(text)
+        if cleaned is None:
+            cleaned = _cached(_clean_cache, text, _CleanUnit(remove_comments(text).split('\n')))
+        units.append((start, text, cleaned.lines, cleaned))
+
+    # Usage matches never span lines, so the whole-file counts of
+    # refactor_code_python are sums of the per-unit counts
+    import re
+    from collections import Counter
+    words = Counter()
+    for unit in units:
+        words.update(unit[3].words)
+    counts = {}
+
+    def count(name):
+        value = counts.get(name)
+        if value is None:
+            if re.fullmatch(r'\w+', name):
+                value = words.get(name, 0)
+            else:
+                value = sum(unit[3].count(name) for unit in units)
+            counts[name] = value
+        return value
+
+    new_lines = []
+    provenance = []
+    removed = {}
+    renames = {}
+    for k, (start, text, lines, _) in enumerate(units):
+        next_line = units[k + 1][2][0] if k + 1 < len(units) else None
+        key = (text, next_line is not None and next_line.strip().startswith(('"""', "'''")))
+
+        cached = _rewrite_cache.get(key)
+        if cached is None or any(count(name) != value for name, value in cached[1].items()):
+            consulted = {}
+
+            def tracked(name):
+                consulted[name] = count(name)
+                return consulted[name]
+
+            result = _rewrite_lines(lines, original_lines[start:start + len(lines)], next_line, tracked)
+            cached = _cached(_rewrite_cache, key, (result, consulted))
+
+        unit_lines, unit_provenance, unit_removed, unit_renames = cached[0]
+        new_lines.extend(unit_lines)
+        provenance.extend((origin + start, reasons) for origin, reasons in unit_provenance)
+        for origin, reason in unit_removed.items():
+            removed[origin + start] = reason
+        renames.update(unit_renames)
+    return new_lines, provenance, removed, renames
@@ -0,0 +1,135 @@
+"""
+Reusable analyzer with its language tables built up front.
+
+The module-level functions build their regexes, lexer tables and rule
+pipelines lazily, on first use, into module caches. An Analyzer builds all
+of them when it is created, so no request pays for them, and keeps no
+per-call state: one instance can be shared by any number of threads.
+
+Created in a parent process before forking, the compiled state is inherited
+copy-on-write by the workers; prefork() also freezes the objects allocated
+so far (gc.freeze) so garbage collections in the workers do not touch, and
+thereby copy, the shared pages.
+"""
+
+LANGUAGES = ("Python", "C", "C++")
+
+# Small inputs run once per language when warming, so every lazily imported
+# module and lazily compiled table (tokenize, ast, re's cache) is loaded
+WARMUP_CODE = {
+    "Python": (
+        'import os, sys\n'
+        '\n'
+        'def ProcessData(data):\n'
+        '    """Docstring."""\n'
+        '    global counter\n'
+        '    total = eval("1") # comment\n'
+        '    while True:\n'
+        '        if data == True: return total / 0\n'
+    ),
+    "C": (
+        '#include <stdio.h>\n'
+        'int main() {\n'
+        '    int x;\n'
+        '    char buf[8]; /* comment */\n'
+        '    if (x = 1) { gets(buf); }\n'
+        '    printf("%d %d\\n", x);\n'
+        '    return 0;\n'
+        '    x = 2;\n'
+        '}\n'
+    ),
+}
+WARMUP_CODE["C++"] = WARMUP_CODE["C"] + 'class A { public: int *p = new int; };\n'
+
+
+class Analyzer:
+    """
+    Shareable, pre-warmed entry point to the analyses of the given languages.
+    rules and engine are the defaults of analyze(); warm=False defers
+    building the tables to the first warm() call (or to first use).
+    """
+    def __init__(self, languages=LANGUAGES, rules=None, engine="lines", warm=True):
+        import threading
+        from .rules import rule_set
+        self.languages = tuple(languages)
+        self.rules = rule_set(rules)
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._warm = False
+        if warm:
+            self.warm()
+
+    def warm(self):
+        """
+        Compiles every regex, lexer table and rule pipeline of the analyzer's
+        languages and imports the modules the analyses load lazily. Safe to
+        call more than once and from several threads.
+        """
+        with self._lock:
+            if self._warm:
+                return self
+            from .lexer import token_regex
+            from .patterns import PATTERNS, compiled
+            from .rules import compile_pipeline
+            for name in PATTERNS:
+                compiled(name)
+            for language in self.languages:
+                token_regex(language)
+                token_regex(language, binary=True)
+                compile_pipeline(language, self.rules)
+                code = WARMUP_CODE[language]
+                for engine in ("lines", "ast"):
+                    self.analysis(code, language, engine).get('symbol_table')
+                    self.analysis(code, language, engine).get('issues')
+                self.analysis(code, language).get('tokens')
+                self.refactor(code, language)
+                self.refactor(code, language, edits=True)
+            self.remove_comments(WARMUP_CODE["Python"])
+            self._warm = True
+        return self
+
+    def prefork(self):
+        """
+        Prepares the process to be forked into workers: warms the analyzer,
+        collects garbage and moves all surviving objects to the permanent
+        generation, so workers share them copy-on-write.
+        """
+        import gc
+        self.warm()
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+        return self
+
+    def analysis(self, code, language="Python", engine=None, workers=None, rules=None):
+        """
+        Lazily computed Analysis of a file with the analyzer's defaults.
+        """
+        from .pipeline import Analysis
+        return Analysis(code, language, engine or self.engine, workers,
+                        self.rules if rules is None else rules)
+
+    def analyze(self, code, language="Python", fields=None, engine=None, workers=None, rules=None):
+        """
+        Same as analyzer.analyze(), with the analyzer's rules and engine by default.
+        """
+        from .pipeline import parse_fields
+        analysis = self.analysis(code, language, engine, workers, rules)
+        return {field: analysis.get(field) for field in parse_fields(fields)}
+
+    def refactor(self, code, language="Python", edits=False):
+        """
+        refactor_code / refactor_code_cpp / refactor_code_python (incremental).
+        """
+        if language == "C":
+            from .c_analysis import refactor_code
+            return refactor_code(code, edits=edits)
+        if language == "C++":
+            from .c_analysis import refactor_code_cpp
+            return refactor_code_cpp(code, edits=edits)
+        from .python_analysis import refactor_code_python
+        return refactor_code_python(code, edits=edits, incremental=True)
+
+    def remove_comments(self, code):
+        from .python_analysis import remove_comments
+        return remove_comments(code)
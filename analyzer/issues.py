@@ -0,0 +1,135 @@
+"""
+Issue records.
+
+Every rule has an id, an issue type and a message template. An Issue only
+stores the rule id, position and message arguments; the message is formatted
+when it is read or serialized, and the display category of each rule is
+computed once here, so counting or grouping issues never touches strings.
+"""
+
+# rule id -> (issue type, message template)
+RULES = {
+    # C / C++
+    'c-void-main': ('Style', "Non-standard 'void main' detected. Use 'int main' and return an integer."),
+    'c-unreachable': ('Dead Code', "Unreachable code detected after return statement: '{0}'"),
+    'c-infinite-loop': ('Infinite Loop', "Potential infinite loop detected. Ensure there is a break statement or exit condition."),
+    'c-division-by-zero': ('Math Error', "Division by zero detected."),
+    'c-assign-in-condition': ('Logic Error', "Assignment in condition detected (e.g., 'if (x = 5)'). Did you mean '=='?"),
+    'c-gets': ('Security', "Unsafe function 'gets' usage. use 'fgets' instead to prevent buffer overflow."),
+    'c-strcpy': ('Security', "Unsafe function 'strcpy' usage. Consider 'strncpy' to prevent buffer overflow."),
+    'c-printf-mismatch': ('Bug', "Potential printf mismatch: Found {0} format specifiers but likely fewer arguments."),
+    'c-uninitialized': ('Bug', "Variable '{0}' might be used without initialization."),
+    'cpp-raw-new': ('Suggestion', "Raw pointer usage detected with 'new'. Consider using 'std::unique_ptr' or 'std::shared_ptr'."),
+    # Python
+    'py-missing-colon': ('Syntax Error', "Missing colon ':' at end of statement."),
+    'py-bare-except': ('Syntax Error', "Bare 'except:' clause is discouraged."),
+    'py-division-by-zero': ('Semantic Error', "Division by zero detected."),
+    'py-unused-variable': ('Semantic Error', "Variable '{0}' assigned but never used."),
+    'py-unused-import': ('Semantic Error', "Unused import '{0}'."),
+    'py-bool-comparison': ('Optimization Suggestion', "Comparison with True/False is unnecessary."),
+    'py-while-true': ('Runtime Risk', "Infinite loop 'while True' detected."),
+    'py-eval': ('Runtime Risk', "Unsafe usage of 'eval()'."),
+    'py-trailing-whitespace': ('Lint Warning', "Trailing whitespace."),
+    'py-line-too-long': ('Lint Warning', "Line too long."),
+    'py-function-name': ('Lint Warning', "Function '{0}' should be snake_case."),
+    'py-global': ('Suggestion', "Global variable usage detected. Avoid globals to improve code maintainability."),
+    'py-multiple-imports': ('Style', "Multiple imports on one line. Import each module on a separate line."),
+    'py-missing-docstring': ('Style', "Missing docstring for function. Add a description."),
+}
+
+# Display categories (indexes into the lists returned by group_issues)
+CATEGORIES = ('Syntax Errors', 'Semantic/Logic Errors', 'Runtime Risks', 'Lint Warnings / Optimization')
+SYNTAX, SEMANTIC, RUNTIME, LINT = range(len(CATEGORIES))
+
+
+def _category(kind):
+    if kind == 'Syntax Error':
+        return SYNTAX
+    if kind in ('Semantic Error', 'Dead Code', 'Logic Error'):
+        return SEMANTIC
+    if kind in ('Runtime Risk', 'Infinite Loop', 'Math Error'):
+        return RUNTIME
+    if 'Lint' in kind or 'Suggestion' in kind or 'Style' in kind:
+        return LINT
+    return None # Security/Bug issues are listed, not grouped
+
+
+RULE_CATEGORY = {rule: _category(kind) for rule, (kind, _) in RULES.items()}
+
+
+class Issue:
+    """
+    One finding: rule id, 1-based line, optional 1-based column and the
+    arguments of the rule's message template.
+    """
+    __slots__ = ('rule', 'line', 'column', 'args')
+
+    def __init__(self, rule, line, *args, column=None):
+        self.rule = rule
+        self.line = line
+        self.column = column
+        self.args = args
+
+    @property
+    def type(self):
+        return RULES[self.rule][0]
+
+    @property
+    def category(self):
+        return RULE_CATEGORY[self.rule]
+
+    @property
+    def message(self):
+        template = RULES[self.rule][1]
+        return template.format(*self.args) if self.args else template
+
+    def __getitem__(self, key):
+        # Read access in the old dict style: issue['type'], issue['message'], ...
+        if key in ('rule', 'line', 'column', 'type', 'message'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_dict(self):
+        """
+        Serialized form: {'type', 'line', 'message', 'rule', 'column'}.
+        """
+        return {'type': self.type, 'line': self.line, 'message': self.message,
+                'rule': self.rule, 'column': self.column}
+
+    # Pickled as a plain tuple (the parallel mode sends issues between processes)
+    def __getstate__(self):
+        return self.rule, self.line, self.column, self.args
+
+    def __setstate__(self, state):
+        self.rule, self.line, self.column, self.args = state
+
+    def __eq__(self, other):
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return (self.rule, self.line, self.column, self.args) == (other.rule, other.line, other.column, other.args)
+
+    def __hash__(self):
+        return hash((self.rule, self.line, self.column, self.args))
+
+    def __repr__(self):
+        return f"Issue({self.rule!r}, line={self.line})"
+
+
+def group_issues(issues):
+    """
+    Splits issues by display category in one pass; returns a list indexed by
+    SYNTAX, SEMANTIC, RUNTIME and LINT.
+    """
+    groups = [[] for _ in CATEGORIES]
+    for issue in issues:
+        category = RULE_CATEGORY[issue.rule]
+        if category is not None:
+            groups[category].append(issue)
+    return groups
+
+
+def issues_to_dicts(issues):
+    """
+    Formats the messages and returns JSON-ready dicts.
+    """
+    return [issue.to_dict() for issue in issues]
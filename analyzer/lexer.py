@@ -0,0 +1,291 @@
+import keyword
+
+# C/C++ Keywords (Subset)
+C_KEYWORDS = {
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double', 'else', 'enum', 'extern',
+    'float', 'for', 'goto', 'if', 'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
+    'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while'
+}
+
+CPP_KEYWORDS = C_KEYWORDS.union({
+    'asm', 'bool', 'catch', 'class', 'const_cast', 'delete', 'dynamic_cast', 'explicit', 'export', 'false',
+    'friend', 'inline', 'mutable', 'namespace', 'new', 'operator', 'private', 'protected', 'public',
+    'reinterpret_cast', 'static_cast', 'template', 'this', 'throw', 'true', 'try', 'typeid', 'typename',
+    'using', 'virtual', 'wchar_t'
+})
+
+
+def keywords_for(language):
+    """
+    Returns the keyword list used by the lexer for a language.
+    """
+    if language == "C":
+        return list(C_KEYWORDS)
+    elif language == "C++":
+        return list(CPP_KEYWORDS)
+    return keyword.kwlist
+
+
+_token_regexes = {}
+
+
+def token_regex(language, binary=False):
+    """
+    Builds and compiles the lexer regex for a language on first use.
+    binary=True returns the bytes version used by lex_file().
+    """
+    regex = _token_regexes.get((language, binary))
+    if regex is None:
+        regex = _token_regexes[(language, binary)] = _build_token_regex(language, binary)
+    return regex
+
+
+def _build_token_regex(language, binary=False):
+    import re
+    kw_list = keywords_for(language)
+
+    # Comments and strings may span lines: the regex runs over the whole
+    # buffer, so they are matched as single tokens instead of line by line.
+    # Quoted strings end at the line end unless it is escaped.
+    quoted = r'"(?:[^"\\\n]|\\[\s\S])*"|' + r"'(?:[^'\\\n]|\\[\s\S])*'"
+    if language == "Python":
+        comment = r'#[^\n]*'
+        string = r'"""[\s\S]*?"""|' + r"'''[\s\S]*?'''|" + quoted
+    else:
+        comment = r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)' # an unclosed block comment runs to the end
+        string = quoted
+
+    # Regex patterns for tokens
+    token_specs = [
+        ('SKIP',    r'\s+'), # newlines too, lines come from the offset table
+        ('COMMENT', comment),
+        ('STRING',  string),
+        ('KEYWORD', r'\b(' + '|'.join(map(re.escape, kw_list)) + r')\b'),
+        ('NUMBER',  r'\b\d+(\.\d*)?\b'),
+        ('OP',      r'[+\-*/=<>!]+'),
+        ('ID',      r'[A-Za-z_][A-Za-z0-9_]*'),
+        ('PUNCT',   r'[():,[\]{}]'),
+        ('MISMATCH',r'.'),
+    ]
+    pattern = '|'.join('(?P<%s>%s)' % pair for pair in token_specs)
+    # The bytes version runs directly over memory-mapped files (lex_file)
+    return re.compile(pattern.encode('ascii') if binary else pattern)
+
+
+# Matched but never emitted
+_SKIPPED = frozenset(('SKIP', 'COMMENT', 'MISMATCH'))
+
+# Identifiers (and densest lines) listed in a token summary
+TOP_K = 20
+
+
+def newline_offsets(buffer):
+    """
+    Returns an array of the offsets of every newline in a str or bytes-like buffer.
+    """
+    from array import array
+    offsets = array('q')
+    newline = b'\n' if not isinstance(buffer, str) else '\n'
+    find = buffer.find
+    pos = find(newline)
+    while pos != -1:
+        offsets.append(pos)
+        pos = find(newline, pos + 1)
+    return offsets
+
+
+def _non_ascii_lines(buffer, newlines):
+    # Indexes of the lines of a bytes buffer holding non-ASCII bytes
+    import re
+    from bisect import bisect_left
+    lines = set()
+    for match in re.finditer(rb'[\x80-\xff]+', buffer):
+        lines.add(bisect_left(newlines, match.start()))
+    return lines
+
+
+def _iter_buffer(regex, buffer, decode=None):
+    """
+    Single pass of the lexer regex over a whole buffer, yielding tokens as
+    they are matched. Each token's start offset is mapped to its line and
+    column with a bisect on the newline offset table, done only when a
+    token starts past the current line. For bytes buffers (decode given),
+    columns on non-ASCII lines are counted in decoded characters.
+    """
+    from bisect import bisect_left
+
+    newlines = newline_offsets(buffer)
+    newlines.append(len(buffer)) # sentinel: the last line ends at the end
+    line_idx = 0
+    line_start = 0
+    line_end = newlines[0]
+    wide_lines = _non_ascii_lines(buffer, newlines) if decode else ()
+    line_ascii = 0 not in wide_lines
+    for match in regex.finditer(buffer):
+        kind = match.lastgroup
+        if kind in _SKIPPED:
+            continue
+        start = match.start()
+        if start > line_end:
+            line_idx = bisect_left(newlines, start, line_idx)
+            line_start = newlines[line_idx - 1] + 1
+            line_end = newlines[line_idx]
+            line_ascii = line_idx not in wide_lines
+        value = match.group()
+        yield {
+            'type': kind,
+            'value': decode(value) if decode else value,
+            'line': line_idx + 1,
+            'column': start - line_start + 1 if line_ascii else len(decode(buffer[line_start:start])) + 1,
+        }
+
+
+def _lex_buffer(regex, buffer, decode=None):
+    """
+    All the tokens of _iter_buffer() as a list.
+    """
+    return list(_iter_buffer(regex, buffer, decode))
+
+
+def _summarize(regex, buffer, top_k=TOP_K, decode=None):
+    """
+    Streams the lexer regex over a buffer keeping only counters: tokens by
+    type, tokens per line (as a histogram plus the densest lines) and
+    identifier frequencies. Memory grows with the number of distinct
+    identifiers, not with the number of tokens or lines.
+    """
+    from heapq import heappush, heappushpop, nlargest
+
+    newline = '\n' if isinstance(buffer, str) else b'\n'
+    by_type = {}
+    identifiers = {}
+    histogram = {}
+    densest = [] # min-heap of (tokens, -line), at most top_k entries
+    line = 1
+    line_tokens = 0
+    for match in regex.finditer(buffer):
+        kind = match.lastgroup
+        if kind == 'ID':
+            name = match.group()
+            identifiers[name] = identifiers.get(name, 0) + 1
+        elif kind == 'SKIP' or kind == 'COMMENT' or kind == 'STRING':
+            if kind == 'STRING':
+                by_type[kind] = by_type.get(kind, 0) + 1
+                line_tokens += 1
+            breaks = match.group().count(newline)
+            if breaks:
+                # Lines end here; the token (a string) counts on its first line
+                if line_tokens:
+                    histogram[line_tokens] = histogram.get(line_tokens, 0) + 1
+                    entry = (line_tokens, -line)
+                    if len(densest) < top_k:
+                        heappush(densest, entry)
+                    elif top_k:
+                        heappushpop(densest, entry)
+                    line_tokens = 0
+                line += breaks
+            continue
+        elif kind == 'MISMATCH':
+            continue
+        by_type[kind] = by_type.get(kind, 0) + 1
+        line_tokens += 1
+    if line_tokens:
+        histogram[line_tokens] = histogram.get(line_tokens, 0) + 1
+        entry = (line_tokens, -line)
+        if len(densest) < top_k:
+            heappush(densest, entry)
+        elif top_k:
+            heappushpop(densest, entry)
+
+    total = sum(by_type.values())
+    histogram[0] = line - sum(histogram.values())
+    top = nlargest(top_k, identifiers.items(), key=lambda item: item[1])
+    return {
+        'tokens': total,
+        'by_type': dict(sorted(by_type.items(), key=lambda item: -item[1])),
+        'lines': line,
+        'density': {
+            'mean': round(total / line, 3),
+            'max': max(histogram),
+            'histogram': [list(item) for item in sorted(histogram.items())], # [tokens per line, lines]
+            'densest': [{'line': -neg_line, 'tokens': count} for count, neg_line in sorted(densest, reverse=True)],
+        },
+        'identifiers': {
+            'distinct': len(identifiers),
+            'top': [{'name': decode(name) if decode else name, 'count': count} for name, count in top],
+        },
+    }
+
+
+def token_summary(code, language="Python", top_k=TOP_K):
+    """
+    Summary of the tokens of a source instead of the tokens themselves:
+    {'tokens', 'by_type', 'lines', 'density', 'identifiers'}, with the
+    top_k most frequent identifiers and densest lines. The tokens are
+    counted as they are matched, never stored.
+    """
+    return _summarize(token_regex(language), code, top_k)
+
+
+def lex_file(path, language="Python", encoding="utf-8", summary=False, top_k=TOP_K):
+    """
+    File-path entry point of the lexer for very large sources: the file is
+    memory-mapped and the bytes version of the lexer regex runs directly over
+    the mapping, so the source is never held as a str. Only emitted token
+    values are decoded. Returns the same token dicts as lexical_analysis(),
+    or with summary=True the same summary as token_summary().
+    """
+    regex = token_regex(language, binary=True)
+    decode = lambda value: value.decode(encoding, 'replace')
+    with _mapped(path) as mapping:
+        if summary:
+            return _summarize(regex, mapping, top_k, decode)
+        return _lex_buffer(regex, mapping, decode)
+
+
+def iter_file_tokens(path, language="Python", encoding="utf-8"):
+    """
+    Streaming version of lex_file(): yields the tokens as they are matched,
+    so only the newline offset table is held in memory, never the token
+    list. The file stays mapped until the generator is exhausted or closed.
+    """
+    regex = token_regex(language, binary=True)
+    with _mapped(path) as mapping:
+        yield from _iter_buffer(regex, mapping, lambda value: value.decode(encoding, 'replace'))
+
+
+def _mapped(path):
+    # Read-only mapping of a file (a context manager); b'' for an empty
+    # file, which cannot be mapped
+    import contextlib
+    import mmap
+
+    @contextlib.contextmanager
+    def mapping():
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # empty file, nothing to map
+                yield b''
+                return
+            with mapped:
+                yield mapped
+    return mapping()
+
+
+def lexical_analysis(code, language="Python", workers=None, summary=False, top_k=TOP_K):
+    """
+    Phase 1: Lexical Analysis
+    Breaks code into tokens (Keywords, Identifiers, Operators, Literals) of
+    the form {'type', 'value', 'line', 'column'}; a multi-line string is a
+    single token on its first line, comments are skipped.
+    workers > 1 lexes large files in parallel chunks. summary=True returns
+    token_summary() instead of the token list.
+    """
+    if summary:
+        return token_summary(code, language, top_k)
+    if workers and workers > 1:
+        from . import parallel
+        return parallel.lex_parallel(code, language, workers)
+
+    return _lex_buffer(token_regex(language), code)
@@ -0,0 +1,98 @@
+"""
+Per-line metrics (length, trailing whitespace) for a whole file.
+
+With NumPy installed, large sources are viewed as one array of code points
+and every metric is a handful of vectorized operations over the newline
+offset array; otherwise (or for small inputs) a plain loop computes the same
+values. NumPy is optional and only imported on first use.
+"""
+
+# Below this size the array setup costs more than the plain loop
+NUMPY_MIN_CHARS = 1 << 16
+
+_numpy = None
+
+
+def _load_numpy():
+    # Returns the numpy module, or False if it is not installed
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+class LineMetrics:
+    """
+    Metrics of every physical line, indexed from 0 (line number - 1).
+    The sequences are NumPy arrays or lists depending on the backend.
+    """
+    __slots__ = ('lengths', 'trailing', 'backend')
+
+    def __init__(self, lengths, trailing, backend):
+        self.lengths = lengths      # characters per line, without the newline
+        self.trailing = trailing    # True if the line ends with a space or tab
+        self.backend = backend      # 'numpy' or 'python'
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def long_lines(self, limit=79):
+        """
+        Set of 1-based line numbers longer than limit characters.
+        """
+        if self.backend == 'numpy':
+            return set((_numpy.flatnonzero(self.lengths > limit) + 1).tolist())
+        return {i + 1 for i, length in enumerate(self.lengths) if length > limit}
+
+    def trailing_whitespace_lines(self):
+        """
+        Set of 1-based line numbers ending with a space or tab.
+        """
+        if self.backend == 'numpy':
+            return set((_numpy.flatnonzero(self.trailing) + 1).tolist())
+        return {i + 1 for i, flag in enumerate(self.trailing) if flag}
+
+
+def _python_metrics(code):
+    lines = code.split('\n')
+    lengths = [len(line) for line in lines]
+    trailing = [line.endswith((' ', '\t')) for line in lines]
+    return LineMetrics(lengths, trailing, 'python')
+
+
+def _numpy_metrics(code, np):
+    # One element per character so lengths match len(line) for any text
+    if code.isascii():
+        chars = np.frombuffer(code.encode('ascii'), dtype=np.uint8)
+    else:
+        chars = np.frombuffer(code.encode('utf-32-le'), dtype=np.uint32)
+    size = len(chars)
+
+    newlines = np.flatnonzero(chars == 10)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [size]))
+    lengths = ends - starts
+
+    # Last character of each non-empty line (empty lines read a harmless 0)
+    last = np.append(chars, 0)[ends - 1]
+    trailing = (lengths > 0) & ((last == 32) | (last == 9))
+
+    return LineMetrics(lengths, trailing, 'numpy')
+
+
+def line_metrics(code, use_numpy=None):
+    """
+    Computes the per-line metrics of code. use_numpy=None picks NumPy when it
+    is installed and the input is large enough; True/False forces a backend
+    (True still falls back when NumPy is missing).
+    """
+    if use_numpy is None:
+        use_numpy = len(code) >= NUMPY_MIN_CHARS
+    np = _load_numpy() if use_numpy else False
+    if np:
+        return _numpy_metrics(code, np)
+    return _python_metrics(code)
@@ -0,0 +1,166 @@
+"""
+Intra-file parallel analysis.
+
+Large files are split at safe top-level boundaries (brace depth 0 for C/C++,
+column-0 def/class for Python), the chunks are analyzed in a process pool
+and the results are merged with their line numbers shifted back. Rules that
+need the whole file (Python unused variables/imports) run on each chunk as
+if it were the whole file; the names they report are then looked up in
+every chunk, in the pool too, and a final reduce step only combines the
+answers, keeping the issues whose name no other chunk uses. Issues are
+returned ordered by line.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Chunks smaller than this are not worth the inter-process round trip
+MIN_CHUNK_LINES = 2000
+
+# Pools never have more processes than this, whatever callers ask for
+MAX_WORKERS = os.cpu_count() or 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers):
+    """
+    Returns a process pool with the given number of workers (at most
+    MAX_WORKERS), reused across calls (and threads: concurrent first calls
+    create a single pool).
+    """
+    workers = max(1, min(workers, MAX_WORKERS))
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def python_boundaries(lines):
+    """
+    1-based lines where a column-0 'def'/'class' (or its first decorator)
+    starts, skipping lines inside triple-quoted strings.
+    """
+    from .python_analysis import top_level_lines
+    boundaries = []
+    prev_decorator = False
+    for i, line in top_level_lines(lines):
+        if not prev_decorator and line.startswith(('def ', 'async def ', 'class ', '@')):
+            boundaries.append(i + 1)
+        prev_decorator = line.startswith('@')
+    return boundaries
+
+
+def c_boundaries(code):
+    """
+    1-based lines right after a top-level scope closes at brace depth 0
+    (found from the braces alone: no scope tree is built).
+    """
+    from .c_scopes import top_level_boundaries
+    return top_level_boundaries(code)
+
+
+def split_chunks(code, language, workers, min_chunk_lines=MIN_CHUNK_LINES):
+    """
+    Splits code into [(line offset, chunk text)] of roughly equal size,
+    cutting only at safe top-level boundaries.
+    """
+    lines = code.split('\n')
+    target = max(min_chunk_lines, -(-len(lines) // workers))
+    if len(lines) < 2 * min_chunk_lines:
+        return [(0, code)]
+
+    boundaries = python_boundaries(lines) if language == "Python" else c_boundaries(code)
+    chunks = []
+    start = 1
+    for boundary in boundaries:
+        if boundary - start >= target:
+            chunks.append((start - 1, '\n'.join(lines[start - 1:boundary - 1])))
+            start = boundary
+    chunks.append((start - 1, '\n'.join(lines[start - 1:])))
+    return chunks
+
+
+def _analyze_chunk(language, chunk, rules=None):
+    # Runs in a worker process
+    if language == "Python":
+        from .python_analysis import _analyze_lines
+        return _analyze_lines(chunk, rules=rules)
+    if language == "C++":
+        from .c_analysis import analyze_code_cpp
+        return analyze_code_cpp(chunk, rules=rules)
+    from .c_analysis import analyze_code
+    return analyze_code(chunk, rules=rules)
+
+
+def _used_names(language, chunk, names):
+    # Runs in a worker process
+    from .python_analysis import used_names
+    return used_names(chunk, names)
+
+
+def _lex_chunk(language, chunk):
+    # Runs in a worker process
+    from .lexer import lexical_analysis
+    return lexical_analysis(chunk, language)
+
+
+def _map_chunks(func, language, chunks, workers, *args):
+    """
+    Runs func(language, chunk, *args) over the chunks in the pool and returns
+    the results in chunk order.
+    """
+    pool = get_pool(workers)
+    futures = [pool.submit(func, language, chunk, *args) for _, chunk in chunks]
+    return [future.result() for future in futures]
+
+
+def _shift(items, offset):
+    # Shifts the line numbers of a chunk's tokens (dicts) or issues (Issue
+    # records) by the chunk's line offset
+    if offset:
+        for item in items:
+            if isinstance(item, dict):
+                item['line'] += offset
+            else:
+                item.line += offset
+    return items
+
+
+def analyze_parallel(code, language, workers, rules=None):
+    """
+    Parallel version of analyze_code / analyze_code_cpp / analyze_code_python
+    (line engine).
+    """
+    chunks = split_chunks(code, language, workers)
+    if len(chunks) < 2:
+        return _analyze_chunk(language, code, rules)
+
+    results = [_shift(result, offset) for (offset, _), result
+               in zip(chunks, _map_chunks(_analyze_chunk, language, chunks, workers, rules))]
+    if language == "Python":
+        # Reduce step: drop the whole-file issues of names other chunks use
+        from .python_analysis import merge_file_issues
+        from .rules.python import FILE_RULE_LOOKS_BACK
+        names = {issue.args[0] for result in results for issue in result if issue.rule in FILE_RULE_LOOKS_BACK}
+        found = _map_chunks(_used_names, language, chunks, workers, names) if names else [names] * len(chunks)
+        issues = merge_file_issues(list(zip(results, found)))
+    else:
+        issues = [issue for result in results for issue in result]
+    issues.sort(key=lambda issue: issue.line)
+    return issues
+
+
+def lex_parallel(code, language, workers):
+    """
+    Parallel version of lexical_analysis.
+    """
+    chunks = split_chunks(code, language, workers)
+    if len(chunks) < 2:
+        return _lex_chunk(language, code)
+    results = _map_chunks(_lex_chunk, language, chunks, workers)
+    return [token for (offset, _), result in zip(chunks, results) for token in _shift(result, offset)]
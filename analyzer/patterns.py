@@ -0,0 +1,56 @@
+"""
+Regex tables shared by the analyzers.
+
+Patterns are kept as source strings and compiled on first use, so importing
+the package does not pay for loading 're' or compiling anything.
+"""
+PATTERNS = {
+    # C/C++ checks
+    'c_assign_in_if': r'if\s*\(.*[^=!<>]=\s*[^=].*\)',
+    'c_format_spec': r'%[dDfFsSc]',
+    # 'int x;' lines, searched for after the newline in front of each line
+    'c_int_decl_lines': r'\n[^\S\n]*int[^\S\n]+([a-zA-Z_][a-zA-Z0-9_]*)[^\S\n]*;',
+    'c_var_decl': r'(int|float|double|char|bool|auto)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*(=|;)',
+    'c_func_header': r'(void|int|float|double)\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\(',
+    'c_func_name': r'\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(',
+    # Lines starting with a type of c_var_decl/c_func_header, searched for
+    # after the newline in front of each line
+    'c_type_lines': r'\n[^\S\n]*(?:int|float|double|char|bool|auto|void)',
+    'c_include': r'(?m)^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\n]+)[>"]',
+    # Brace-scope tree: comments, strings and directives (masked out first;
+    # a '#' is only a directive at the start of a line), then in the masked
+    # code the braces, 'return's, lines starting with '}', statements
+    # starting with '}' or a label, the end of a statement (and of one
+    # without braces or parentheses), the labels in front of one, and
+    # struct/namespace words
+    'c_spans': r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?|#(?:\\\n|[^\n])*',
+    'c_braces': r'[{}]',
+    'c_return': r'return(?!\w)',
+    'c_close_lines': r'\n[^\S\n\x1f]*\}',
+    'c_leading_token': r'[^\S\n\x1f]*(?:(\})|(?:case|default|public|private|protected)(?!\w))',
+    'c_statement_end': r'[;{}]',
+    'c_plain_statement': r'[^;{}(]*;',
+    'c_statement_labels': r'\s*(?:(?:case|default|public|private|protected)(?!\w)[^:]*:\s*)*',
+    'c_scope_words': r'struct|union|enum|class|namespace',
+    'c_token': r'[A-Za-z_]\w*|\d\w*|[^\s\w]',
+    'c_word': r'(?<![\w])[A-Za-z_]\w*',
+
+    # Python checks
+    'py_def_name': r'def\s+([a-zA-Z0-9_]+)',
+    'py_eval_assign': r'(\s*)(\w+)\s*=\s*eval\(',
+    'snake_case_1': r'(.)([A-Z][a-z]+)',
+    'snake_case_2': r'([a-z0-9])([A-Z])',
+}
+
+_compiled = {}
+
+
+def compiled(name):
+    """
+    Returns the compiled regex for a named pattern, compiling it on first use.
+    """
+    regex = _compiled.get(name)
+    if regex is None:
+        import re
+        regex = _compiled[name] = re.compile(PATTERNS[name])
+    return regex
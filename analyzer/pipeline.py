@@ -0,0 +1,149 @@
+"""
+Field-selected analysis.
+
+The public results ('tokens', 'issues', 'symbol_table') and the structures
+they share (the Python AST walk, the C/C++ scope tree) are phases of an
+Analysis. A phase runs on first access and pulls in only the phases it
+depends on, so asking for issues alone never lexes the file or builds the
+symbol table.
+"""
+
+FIELDS = ('tokens', 'issues', 'symbol_table')
+
+# Accepted in a field selection but not part of the default one
+EXTRA_FIELDS = ('token_summary',)
+
+
+def _python_ast(analysis):
+    # Single parse + walk shared by issues and symbols (None on syntax errors)
+    from . import python_ast
+    from .rules import rule_set
+    return python_ast.analyze(analysis.code, rule_set(analysis.rules).options['max_line_length'])
+
+
+def _c_tree(analysis):
+    from .c_scopes import build_c_scope_tree
+    return build_c_scope_tree(analysis.code)
+
+
+def _tokens(analysis):
+    from .lexer import lexical_analysis
+    return lexical_analysis(analysis.code, analysis.language, workers=analysis.workers)
+
+
+def _token_summary(analysis):
+    # Counts only: the tokens are never stored (see lexer.token_summary)
+    from .lexer import token_summary
+    return token_summary(analysis.code, analysis.language)
+
+
+def _issues(analysis):
+    if analysis.language in ("C", "C++"):
+        from .c_analysis import analyze_code, analyze_code_cpp
+        check = analyze_code_cpp if analysis.language == "C++" else analyze_code
+        if analysis.workers and analysis.workers > 1:
+            # Chunks build their own trees in the worker processes
+            return check(analysis.code, workers=analysis.workers, rules=analysis.rules)
+        return check(analysis.code, tree=analysis.get('c_tree'), rules=analysis.rules)
+
+    from .python_analysis import analyze_code_python, ast_engine_issues
+    if analysis.engine == "ast":
+        result = analysis.get('python_ast')
+        if result is not None:
+            return ast_engine_issues(result, analysis.rules)
+    return analyze_code_python(analysis.code, workers=analysis.workers, rules=analysis.rules)
+
+
+def _symbol_table(analysis):
+    from .symbols import semantic_analysis_symbol_table
+    if analysis.language in ("C", "C++"):
+        return semantic_analysis_symbol_table(analysis.code, analysis.language, tree=analysis.get('c_tree'))
+    if analysis.language == "Python" and analysis.engine == "ast":
+        result = analysis.get('python_ast')
+        if result is not None:
+            return list(result.symbols)
+    return semantic_analysis_symbol_table(analysis.code, analysis.language)
+
+
+PHASES = {
+    'python_ast': _python_ast,
+    'c_tree': _c_tree,
+    'tokens': _tokens,
+    'token_summary': _token_summary,
+    'issues': _issues,
+    'symbol_table': _symbol_table,
+}
+
+
+class Analysis:
+    """
+    Lazily computed phases of one source file; each phase runs at most once.
+    rules selects the enabled issue rules (see analyzer.rules).
+    """
+    def __init__(self, code, language="Python", engine="lines", workers=None, rules=None):
+        self.code = code
+        self.language = language
+        self.engine = engine
+        self.workers = workers
+        self.rules = rules
+        self._results = {}
+
+    def get(self, phase):
+        """
+        Returns a phase's result, computing it (and its dependencies) on first use.
+        """
+        if phase not in self._results:
+            if phase not in PHASES:
+                raise ValueError(f"Unknown analysis phase '{phase}'")
+            self._results[phase] = PHASES[phase](self)
+        return self._results[phase]
+
+    def computed(self):
+        """
+        Names of the phases evaluated so far.
+        """
+        return list(self._results)
+
+
+def parse_fields(fields):
+    """
+    Normalizes a field selection (None, a comma-separated string or a list)
+    to a tuple of known field names.
+    """
+    if fields is None:
+        return FIELDS
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    elif not isinstance(fields, (list, tuple)):
+        raise ValueError("'fields' must be a comma-separated string or a list of field names")
+    unknown = [str(field) for field in fields if not isinstance(field, str) or (field not in FIELDS and field not in EXTRA_FIELDS)]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Valid fields: {', '.join(FIELDS + EXTRA_FIELDS)}")
+    return tuple(fields)
+
+
+def parse_workers(workers):
+    """
+    Validates a worker count from a request: None, or a non-negative int
+    (or digit string). 0 and 1 mean serial (None); larger counts are
+    capped at the CPU count.
+    """
+    if workers is None or workers == '':
+        return None
+    if isinstance(workers, str) and workers.strip().isdigit():
+        workers = int(workers)
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 0:
+        raise ValueError(f"Invalid worker count {workers!r}: expected a non-negative integer")
+    if workers < 2:
+        return None
+    import os
+    return min(workers, os.cpu_count() or 1)
+
+
+def analyze(code, language="Python", fields=None, engine="lines", workers=None, rules=None):
+    """
+    Runs the requested phases (all of FIELDS by default) and returns
+    {field: result} for those fields only.
+    """
+    analysis = Analysis(code, language, engine, workers, rules)
+    return {field: analysis.get(field) for field in parse_fields(fields)}
@@ -0,0 +1,347 @@
+"""
+Project-wide Python symbol index.
+
+Every .py file under a root is parsed once into its definitions (modules,
+top-level functions and classes, methods) and its references (imported
+names, module globals, attribute accesses). The rows are stored in a SQLite
+database at the root, indexed by name; later runs re-parse and replace the
+rows of only the files whose mtime or size changed, and "who uses X" and
+"what is dead" are answered by queries on the stored index in milliseconds.
+
+References are resolved through imports: 'from pkg import mod' then
+'mod.func()' references 'pkg.mod.func'. Accesses on objects whose type is
+unknown ('self.save()') are kept as bare attribute names ('.save') and
+count as a use of every method or function with that name, which keeps
+dead-code answers on the conservative side.
+"""
+import os
+
+# Bumped when the schema or what is indexed changes (the index is rebuilt)
+INDEX_VERSION = 1
+INDEX_FILENAME = '.analyzer_index.db'
+
+# Definition kinds
+MODULE, CLASS, FUNCTION, METHOD = 'module', 'class', 'function', 'method'
+
+# Files worth a process pool on a (re)build
+PARALLEL_MIN_FILES = 64
+
+
+def module_name(root, relpath):
+    """
+    Dotted module name of a file and whether it is a package's __init__.
+    Names start at the outermost enclosing directory that is still a
+    package (has an __init__.py), as they would be imported.
+    """
+    parts = relpath[:-3].split(os.sep)
+    is_package = parts[-1] == '__init__'
+    if is_package:
+        parts.pop()
+        if not parts: # __init__.py of the root itself
+            return os.path.basename(root), True
+    # Directories above the module file that are packages
+    directory = os.path.dirname(os.path.join(root, relpath))
+    if is_package:
+        directory = os.path.dirname(directory)
+    depth = 0
+    while depth < len(parts) - 1 and os.path.isfile(os.path.join(directory, '__init__.py')):
+        directory = os.path.dirname(directory)
+        depth += 1
+    return '.'.join(parts[len(parts) - depth - 1:]), is_package
+
+
+def _imported_base(module, is_package, level, name):
+    # Absolute module of a (possibly relative) 'from ... import'
+    if not level:
+        return name or ''
+    package = module.split('.') if is_package else module.split('.')[:-1]
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    return '.'.join(package + ([name] if name else []))
+
+
+def _definitions(body, prefix, in_class, defs):
+    # Module/class level definitions, looking inside if/try/with blocks
+    import ast
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            defs.append([f"{prefix}.{node.name}", METHOD if in_class else FUNCTION, node.lineno, bool(node.decorator_list)])
+        elif isinstance(node, ast.ClassDef):
+            qualname = f"{prefix}.{node.name}"
+            defs.append([qualname, CLASS, node.lineno, bool(node.decorator_list)])
+            _definitions(node.body, qualname, True, defs)
+        elif isinstance(node, (ast.If, ast.Try, ast.With)):
+            for block in (node.body, getattr(node, 'orelse', []), getattr(node, 'finalbody', [])):
+                _definitions(block, prefix, in_class, defs)
+            for handler in getattr(node, 'handlers', []):
+                _definitions(handler.body, prefix, in_class, defs)
+
+
+def _module_globals(tree):
+    import ast
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+    return names
+
+
+def index_source(code, module, is_package=False):
+    """
+    Definitions [[qualname, kind, line, entry]] and references [[name, line]]
+    of one module's source. Entry points (decorated definitions, which are
+    registered elsewhere, and modules with a __main__ guard) are flagged as
+    such. Raises SyntaxError.
+    """
+    import ast
+    tree = ast.parse(code)
+    defs = [[module, MODULE, 1, False]]
+    _definitions(tree.body, module, False, defs)
+
+    # One walk: imports are recorded as they come, name uses are resolved
+    # afterwards, once every import of the module is known
+    refs = set()
+    aliases = {}
+    names = []
+    attributes = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Store):
+                names.append(node)
+        elif isinstance(node, ast.Attribute):
+            attributes.append(node)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                refs.add((alias.name, node.lineno))
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    top = alias.name.split('.')[0]
+                    aliases[top] = top
+        elif isinstance(node, ast.ImportFrom):
+            base = _imported_base(module, is_package, node.level, node.module)
+            refs.add((base, node.lineno))
+            for alias in node.names:
+                if alias.name != '*':
+                    target = f"{base}.{alias.name}" if base else alias.name
+                    refs.add((target, node.lineno))
+                    aliases[alias.asname or alias.name] = target
+        elif (isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets)
+              and isinstance(node.value, (ast.List, ast.Tuple))):
+            # Names exported through __all__ are used by definition
+            for element in node.value.elts:
+                if isinstance(element, ast.Constant) and isinstance(element.value, str):
+                    refs.add((f"{module}.{element.value}", node.lineno))
+        elif (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+              and isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__'):
+            defs[0][3] = True # if __name__ == '__main__': run as a script
+
+    module_globals = _module_globals(tree)
+
+    def resolve(name):
+        if name in aliases:
+            return aliases[name]
+        if name in module_globals:
+            return f"{module}.{name}"
+        return None
+
+    for node in names:
+        target = resolve(node.id)
+        if target:
+            refs.add((target, node.lineno))
+    for node in attributes:
+        refs.add(('.' + node.attr, node.lineno))
+        # Dotted chains on a known name: mod.sub.func
+        chain = [node.attr]
+        value = node.value
+        while isinstance(value, ast.Attribute):
+            chain.append(value.attr)
+            value = value.value
+        if isinstance(value, ast.Name):
+            base = resolve(value.id)
+            if base:
+                refs.add(('.'.join([base] + chain[::-1]), node.lineno))
+    return defs, sorted(refs)
+
+
+def index_file(root, relpath):
+    """
+    Index record of one file, {'path', 'mtime_ns', 'size', 'module', 'defs',
+    'refs', 'error'}, or None if the file cannot be read (e.g. it was deleted
+    since the scan). Runs in worker processes on large updates.
+    """
+    from .files import read_source
+    path = os.path.join(root, relpath)
+    try:
+        st = os.stat(path)
+        code = read_source(path)
+    except OSError:
+        return None
+    module, is_package = module_name(root, relpath)
+    record = {'path': relpath, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+              'module': module, 'defs': [], 'refs': [], 'error': None}
+    try:
+        record['defs'], record['refs'] = index_source(code, module, is_package)
+    except (SyntaxError, ValueError) as e:
+        record['error'] = str(e)
+    return record
+
+
+def _expanded(refs):
+    # A use of pkg.mod.func is also a use of pkg.mod and pkg
+    expanded = set()
+    for name, line in refs:
+        expanded.add((name, line))
+        while '.' in name and not name.startswith('.'):
+            name = name.rpartition('.')[0]
+            expanded.add((name, line))
+    return expanded
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime_ns INTEGER, size INTEGER,
+    module TEXT, error TEXT);
+CREATE TABLE IF NOT EXISTS defs (
+    file_id INTEGER NOT NULL, qualname TEXT NOT NULL, short TEXT NOT NULL,
+    kind TEXT NOT NULL, line INTEGER, entry INTEGER);
+CREATE TABLE IF NOT EXISTS refs (file_id INTEGER NOT NULL, name TEXT NOT NULL, line INTEGER);
+CREATE INDEX IF NOT EXISTS defs_qualname ON defs (qualname);
+CREATE INDEX IF NOT EXISTS defs_file ON defs (file_id);
+CREATE INDEX IF NOT EXISTS refs_name ON refs (name, file_id);
+CREATE INDEX IF NOT EXISTS refs_file ON refs (file_id);
+"""
+
+DEAD_QUERY = """
+SELECT d.qualname, d.kind, f.path, d.line FROM defs d JOIN files f ON f.id = d.file_id
+WHERE NOT d.entry AND NOT (d.short LIKE '\\_\\_%\\_\\_' ESCAPE '\\')
+  AND CASE WHEN d.kind = 'module'
+      -- a module is used when another file imports it
+      THEN NOT EXISTS (SELECT 1 FROM refs r WHERE r.name = d.qualname AND r.file_id != d.file_id)
+      ELSE NOT EXISTS (SELECT 1 FROM refs r WHERE r.name = d.qualname)
+           AND NOT EXISTS (SELECT 1 FROM refs r WHERE r.name = '.' || d.short)
+      END
+ORDER BY f.path, d.line
+"""
+
+
+class SymbolIndex:
+    """
+    Persistent index of the Python definitions and references under a root.
+    """
+    def __init__(self, root, path=None, workers=None):
+        import sqlite3
+        self.root = os.path.abspath(root)
+        self.path = path or os.path.join(self.root, INDEX_FILENAME)
+        self.workers = workers or os.cpu_count() or 1
+        self.db = sqlite3.connect(self.path)
+        if self.db.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+            self.db.executescript('DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS defs; DROP TABLE IF EXISTS refs;')
+            self.db.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def file_count(self):
+        return self.db.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def update(self):
+        """
+        Re-indexes new and modified files and drops removed ones.
+        Returns (updated paths, removed paths).
+        """
+        from .files import iter_source_files
+        stored = {path: (file_id, mtime_ns, size)
+                  for file_id, path, mtime_ns, size in self.db.execute('SELECT id, path, mtime_ns, size FROM files')}
+        changed = []
+        seen = set()
+        for path in iter_source_files(self.root):
+            if not path.endswith('.py'):
+                continue
+            relpath = os.path.relpath(path, self.root)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue # gone: dropped below like any removed file
+            seen.add(relpath)
+            previous = stored.get(relpath)
+            if previous is None or previous[1:] != (st.st_mtime_ns, st.st_size):
+                changed.append(relpath)
+        removed = [relpath for relpath in stored if relpath not in seen]
+
+        if len(changed) >= PARALLEL_MIN_FILES and self.workers > 1:
+            from .parallel import get_pool
+            records = get_pool(self.workers).map(index_file, [self.root] * len(changed), changed, chunksize=16)
+        else:
+            records = (index_file(self.root, relpath) for relpath in changed)
+
+        vanished = set()
+        with self.db: # one transaction
+            for relpath in removed + changed:
+                if relpath in stored:
+                    self._delete(stored[relpath][0])
+            for relpath, record in zip(changed, records):
+                if record is None:
+                    # Deleted or unreadable since the scan: its rows stay dropped
+                    vanished.add(relpath)
+                else:
+                    self._insert(record)
+        if vanished:
+            changed = [relpath for relpath in changed if relpath not in vanished]
+            removed += [relpath for relpath in sorted(vanished) if relpath in stored]
+        return changed, removed
+
+    def _delete(self, file_id):
+        for table, column in (('defs', 'file_id'), ('refs', 'file_id'), ('files', 'id')):
+            self.db.execute(f'DELETE FROM {table} WHERE {column} = ?', (file_id,))
+
+    def _insert(self, record):
+        file_id = self.db.execute(
+            'INSERT INTO files (path, mtime_ns, size, module, error) VALUES (?, ?, ?, ?, ?)',
+            (record['path'], record['mtime_ns'], record['size'], record['module'], record['error'])).lastrowid
+        self.db.executemany(
+            'INSERT INTO defs VALUES (?, ?, ?, ?, ?, ?)',
+            [(file_id, qualname, qualname.rpartition('.')[2], kind, line, entry)
+             for qualname, kind, line, entry in record['defs']])
+        self.db.executemany('INSERT INTO refs VALUES (?, ?, ?)',
+                            [(file_id, name, line) for name, line in _expanded(record['refs'])])
+
+    def who_uses(self, name):
+        """
+        [(path, line, reference)] of the uses of a qualified name, plus the
+        attribute accesses that may reach it when it is a function, method or
+        class (reference '.name').
+        """
+        names = [name]
+        kinds = {kind for (kind,) in self.db.execute('SELECT kind FROM defs WHERE qualname = ?', (name,))}
+        if kinds & {FUNCTION, METHOD, CLASS}:
+            names.append('.' + name.rpartition('.')[2])
+        found = []
+        for reference in names:
+            found.extend(self.db.execute(
+                'SELECT f.path, r.line, r.name FROM refs r JOIN files f ON f.id = r.file_id WHERE r.name = ?',
+                (reference,)))
+        return sorted(found)
+
+    def dead(self, kinds=None):
+        """
+        [(qualname, kind, path, line)] of the definitions nothing references.
+        Entry points and dunder names are never reported; a module counts as
+        used only when another file imports it.
+        """
+        return [row for row in self.db.execute(DEAD_QUERY) if not kinds or row[1] in kinds]
+
+
+def build_index(root, path=None, workers=None):
+    """
+    Opens the stored index of a root (creating it on first use) and brings
+    it up to date. Returns (index, updated paths, removed paths).
+    """
+    index = SymbolIndex(root, path, workers)
+    updated, removed = index.update()
+    return index, updated, removed
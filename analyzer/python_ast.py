@@ -0,0 +1,327 @@
+"""
+AST-backed Python analysis engine.
+
+The source is parsed once with 'ast'; all rules then run as visitors during
+a single traversal of the tree, sharing the scope tree (see scopes.py) that
+is built along the way. Files that do not parse return None so callers can
+fall back to the line heuristics.
+"""
+import ast
+
+from .issues import Issue
+from .line_metrics import line_metrics
+from .scopes import ScopeTree
+
+
+class PythonAnalysis:
+    """
+    Result of one parse + walk: the issues, the symbol table and the scope tree.
+    """
+    __slots__ = ('issues', 'symbols', 'scopes')
+
+    def __init__(self, issues, symbols, scopes):
+        self.issues = issues
+        self.symbols = symbols
+        self.scopes = scopes
+
+
+class _Context:
+    """
+    State shared by all rules during the walk.
+    """
+    def __init__(self):
+        self.issues = []
+        self.symbols = []
+        self.tree = ScopeTree()
+        self.assignments = []     # (binding scope, name, line) of plain assignments
+        self.strings = set()      # (lineno, col_offset, end_lineno, end_col_offset) of multi-line strings
+
+    def report(self, rule, line, *args, column=None):
+        self.issues.append(Issue(rule, line, *args, column=column))
+
+
+def _infer_type(value):
+    # Simple Type Inference (same categories as the line heuristics)
+    if isinstance(value, ast.Constant):
+        if isinstance(value.value, bool): return "BOOLEAN"
+        if isinstance(value.value, int): return "INTEGER"
+        if isinstance(value.value, float): return "FLOAT"
+        if isinstance(value.value, str): return "STRING"
+    return "UNKNOWN"
+
+
+def _targets(target):
+    # Flattens tuple/list/starred assignment targets into Name nodes
+    if isinstance(target, (ast.Tuple, ast.List)):
+        for elt in target.elts:
+            yield from _targets(elt)
+    elif isinstance(target, ast.Starred):
+        yield from _targets(target.value)
+    elif isinstance(target, ast.Name):
+        yield target
+
+
+# --- Rules (one function per node type, called during the single walk) ---
+
+def _visit_function(node, scope, ctx):
+    ctx.tree.bind(scope, node.name, node.lineno, 'function')
+    ctx.symbols.append({'name': node.name, 'type': 'FUNCTION', 'scope': scope.qualified_name, 'line': node.lineno})
+    if any(x.isupper() for x in node.name):
+        ctx.report('py-function-name', node.lineno, node.name, column=node.col_offset + 1)
+    if ast.get_docstring(node, clean=False) is None:
+        ctx.report('py-missing-docstring', node.lineno, column=node.col_offset + 1)
+
+def _visit_class(node, scope, ctx):
+    ctx.tree.bind(scope, node.name, node.lineno, 'class')
+    ctx.symbols.append({'name': node.name, 'type': 'CLASS', 'scope': scope.qualified_name, 'line': node.lineno})
+
+def _visit_assign(node, scope, ctx):
+    for target in node.targets:
+        for name in _targets(target):
+            binding_scope = ctx.tree.binding_scope(scope, name.id)
+            ctx.assignments.append((binding_scope, name.id, node.lineno))
+            ctx.symbols.append({
+                'name': name.id,
+                'type': f"VARIABLE ({_infer_type(node.value)})",
+                'scope': binding_scope.qualified_name,
+                'line': node.lineno
+            })
+
+def _visit_augassign(node, scope, ctx):
+    # 'x += 1' reads x as well as writing it
+    if isinstance(node.target, ast.Name):
+        ctx.tree.use(scope, node.target.id, node.lineno)
+
+def _visit_import(node, scope, ctx):
+    for alias in node.names:
+        if alias.name == '*':
+            continue
+        bound = alias.asname or alias.name.split('.')[0]
+        ctx.tree.bind(scope, bound, node.lineno, 'import')
+    if isinstance(node, ast.Import) and len(node.names) > 1:
+        ctx.report('py-multiple-imports', node.lineno, column=node.col_offset + 1)
+
+def _visit_name(node, scope, ctx):
+    if isinstance(node.ctx, ast.Store):
+        ctx.tree.bind(scope, node.id, node.lineno)
+    else:
+        ctx.tree.use(scope, node.id, node.lineno)
+
+def _visit_arg(node, scope, ctx):
+    ctx.tree.bind(scope, node.arg, node.lineno, 'parameter')
+
+def _visit_named_expr(node, scope, ctx):
+    # Walrus targets bind in the nearest enclosing non-comprehension scope
+    while scope.kind == 'comprehension':
+        scope = scope.parent
+    ctx.tree.bind(scope, node.target.id, node.lineno)
+
+def _visit_global(node, scope, ctx):
+    for name in node.names:
+        ctx.tree.declare(scope, name, 'global' if isinstance(node, ast.Global) else 'nonlocal')
+    if isinstance(node, ast.Global):
+        ctx.report('py-global', node.lineno, column=node.col_offset + 1)
+
+def _visit_binop(node, scope, ctx):
+    if isinstance(node.op, ast.Mod) and (isinstance(node.left, ast.JoinedStr)
+                                         or isinstance(node.left, ast.Constant) and isinstance(node.left.value, (str, bytes))):
+        return # '%' formatting, not modulo
+    if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)) and isinstance(node.right, ast.Constant) \
+            and not isinstance(node.right.value, (bool, str)) and node.right.value == 0:
+        ctx.report('py-division-by-zero', node.lineno, column=node.col_offset + 1)
+
+def _visit_compare(node, scope, ctx):
+    for op, right in zip(node.ops, node.comparators):
+        if isinstance(op, ast.Eq) and isinstance(right, ast.Constant) and isinstance(right.value, bool):
+            ctx.report('py-bool-comparison', node.lineno, column=node.col_offset + 1)
+            break
+
+def _visit_while(node, scope, ctx):
+    if isinstance(node.test, ast.Constant) and node.test.value is True:
+        ctx.report('py-while-true', node.lineno, column=node.col_offset + 1)
+
+def _visit_except(node, scope, ctx):
+    if node.type is None:
+        ctx.report('py-bare-except', node.lineno, column=node.col_offset + 1)
+    if node.name:
+        ctx.tree.bind(scope, node.name, node.lineno)
+
+def _visit_call(node, scope, ctx):
+    if isinstance(node.func, ast.Name) and node.func.id == 'eval':
+        ctx.report('py-eval', node.lineno, column=node.col_offset + 1)
+
+def _visit_string(node, scope, ctx):
+    # Multi-line string literals, for the trailing whitespace check
+    if node.end_lineno > node.lineno and (type(node) is ast.JoinedStr or isinstance(node.value, (str, bytes))):
+        ctx.strings.add((node.lineno, node.col_offset, node.end_lineno, node.end_col_offset))
+
+
+VISITORS = {
+    ast.FunctionDef: [_visit_function],
+    ast.AsyncFunctionDef: [_visit_function],
+    ast.ClassDef: [_visit_class],
+    ast.Assign: [_visit_assign],
+    ast.AugAssign: [_visit_augassign],
+    ast.Import: [_visit_import],
+    ast.ImportFrom: [_visit_import],
+    ast.Name: [_visit_name],
+    ast.arg: [_visit_arg],
+    ast.NamedExpr: [_visit_named_expr],
+    ast.Global: [_visit_global],
+    ast.Nonlocal: [_visit_global],
+    ast.BinOp: [_visit_binop],
+    ast.Compare: [_visit_compare],
+    ast.While: [_visit_while],
+    ast.ExceptHandler: [_visit_except],
+    ast.Call: [_visit_call],
+    ast.Constant: [_visit_string],
+    ast.JoinedStr: [_visit_string],
+}
+
+COMPREHENSIONS = {
+    ast.ListComp: '<listcomp>', ast.SetComp: '<setcomp>',
+    ast.DictComp: '<dictcomp>', ast.GeneratorExp: '<genexpr>',
+}
+
+
+def _arguments(args, outer, inner):
+    # Defaults are evaluated in the enclosing scope, parameters bind in the new one
+    for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+        yield default, outer
+    for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+        if arg is not None:
+            yield arg, inner
+
+
+def _children(node, scope, tree):
+    """
+    Yields (child, scope) pairs in source order, opening new scopes for
+    functions, lambdas, classes and comprehensions.
+    """
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        inner = tree.new_scope('function', node.name, scope, node.lineno)
+        for child in node.decorator_list:
+            yield child, scope
+        yield from _arguments(node.args, scope, inner)
+        if node.returns is not None:
+            yield node.returns, scope
+        for child in node.body:
+            yield child, inner
+    elif isinstance(node, ast.Lambda):
+        inner = tree.new_scope('lambda', '<lambda>', scope, node.lineno)
+        yield from _arguments(node.args, scope, inner)
+        yield node.body, inner
+    elif isinstance(node, ast.ClassDef):
+        inner = tree.new_scope('class', node.name, scope, node.lineno)
+        for child in node.decorator_list + node.bases + node.keywords:
+            yield child, scope
+        for child in node.body:
+            yield child, inner
+    elif type(node) in COMPREHENSIONS:
+        inner = tree.new_scope('comprehension', COMPREHENSIONS[type(node)], scope, node.lineno)
+        for i, gen in enumerate(node.generators):
+            # Only the first iterable is evaluated in the enclosing scope
+            yield gen.iter, scope if i == 0 else inner
+            yield gen.target, inner
+            for cond in gen.ifs:
+                yield cond, inner
+        if isinstance(node, ast.DictComp):
+            yield node.key, inner
+            yield node.value, inner
+        else:
+            yield node.elt, inner
+    elif isinstance(node, ast.NamedExpr):
+        yield node.value, scope
+    else:
+        for child in ast.iter_child_nodes(node):
+            yield child, scope
+
+
+def _walk(tree, ctx):
+    """
+    Single iterative traversal; each node is dispatched to its rules once.
+    """
+    stack = [(tree, ctx.tree.root)]
+    while stack:
+        node, scope = stack.pop()
+        for visit in VISITORS.get(type(node), ()):
+            visit(node, scope, ctx)
+        stack.extend(reversed(list(_children(node, scope, ctx.tree))))
+
+
+def _string_lines(lines, spans):
+    """
+    Lines that end inside a multi-line string literal. A string node's span
+    can cover several literals (implicit concatenation), so only the source
+    of each span is tokenized, never the whole file.
+    """
+    import io
+    import tokenize
+    in_string = set()
+    for lineno, col, end_lineno, end_col in spans:
+        # AST columns are UTF-8 byte offsets
+        first = lines[lineno - 1].encode('utf-8')[col:].decode('utf-8', 'replace')
+        last = lines[end_lineno - 1].encode('utf-8')[:end_col].decode('utf-8', 'replace')
+        segment = '\n'.join([first] + lines[lineno:end_lineno - 1] + [last])
+        try:
+            # Parenthesized, so line breaks between literals are not statement ends
+            for tok in tokenize.generate_tokens(io.StringIO('(' + segment + ')').readline):
+                if tok.type == tokenize.STRING and tok.end[0] > tok.start[0]:
+                    in_string.update(range(lineno + tok.start[0] - 1, lineno + tok.end[0] - 1))
+        except (tokenize.TokenError, SyntaxError):
+            in_string.update(range(lineno, end_lineno))
+    return in_string
+
+
+def _line_lints(code, ctx, max_line_length):
+    """
+    Physical-line checks. Lines continued inside a multi-line string are
+    skipped for trailing whitespace, since that whitespace is string data.
+    Lengths and trailing whitespace come from line_metrics (vectorized when
+    NumPy is available).
+    """
+    metrics = line_metrics(code)
+    trailing_lines = metrics.trailing_whitespace_lines()
+    if trailing_lines and ctx.strings:
+        trailing_lines -= _string_lines(code.split('\n'), sorted(ctx.strings))
+    for line_num in sorted(trailing_lines | metrics.long_lines(max_line_length)):
+        if line_num in trailing_lines:
+            ctx.report('py-trailing-whitespace', line_num)
+        if metrics.lengths[line_num - 1] > max_line_length:
+            ctx.report('py-line-too-long', line_num, column=max_line_length + 1)
+
+
+def _file_rules(ctx):
+    # Whole-file rules, answered from the resolved scope tree
+    tree = ctx.tree
+    for scope, name, line in ctx.assignments:
+        # Class attributes are read through 'self.'/'cls.', not by name
+        if scope.kind == 'class' or name == '_' or name.startswith('__'):
+            continue
+        if not tree.is_used(scope, name):
+            ctx.report('py-unused-variable', line, name)
+    for scope, name, line, kind in tree.unused(kinds=('import',)):
+        ctx.report('py-unused-import', line, name)
+
+
+def analyze(code, max_line_length=79):
+    """
+    Parses and walks the code once, returning a PythonAnalysis, or None if
+    the code has syntax errors. Lines longer than max_line_length are
+    reported. Nothing is cached here: an Analysis (see pipeline.py) shares
+    one result between the issue, symbol table and scope tree phases.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    ctx = _Context()
+    _walk(tree, ctx)
+    ctx.tree.finalize()
+    _line_lints(code, ctx, max_line_length)
+    _file_rules(ctx)
+
+    ctx.issues.sort(key=lambda issue: issue.line)
+    ctx.symbols.sort(key=lambda symbol: symbol['line'])
+    return PythonAnalysis(ctx.issues, ctx.symbols, ctx.tree)
@@ -0,0 +1,252 @@
+"""
+Rule selection and rule pipelines.
+
+Each language's line rules live in a module of this package (python.py,
+c.py), imported only the first time that language is analyzed. A rule is a
+plain function making the per-line check of its phase (or, for scan rules,
+scanning the lines itself), plus the names of the setup values it needs
+(regexes, line metrics, the scope tree). For a given selection of enabled
+rules and options, the enabled rule functions are composed into a single
+analysis function once, with one loop over the lines per phase; disabled
+rules and the setup only they need are simply not in it, so they cost
+nothing.
+
+A RuleSet selects the rules, either from an API argument, e.g.
+{'disable': ['py-missing-docstring'], 'options': {'max_line_length': 100}},
+or from a JSON config file with the same keys (see load_rules).
+"""
+from ..issues import RULES as KNOWN_RULES
+
+# language -> modules declaring its rules (add a module path to plug in more;
+# relative names are resolved in this package)
+LANGUAGE_MODULES = {
+    'Python': ['.python'],
+    'C': ['.c'],
+    'C++': ['.c'],
+}
+
+DEFAULT_OPTIONS = {
+    'max_line_length': 79,
+}
+
+class Rule:
+    """
+    One rule of a language module: its id, the loop (phase) it runs in, its
+    check function (see the language modules) and the setup values it
+    needs. Scan rules iterate over the file themselves instead of being
+    called per line.
+    trigger is a substring of every (stripped) line a per-line check can
+    report: the check is not called on the other lines.
+    """
+    __slots__ = ('id', 'phase', 'check', 'needs', 'scan', 'trigger')
+
+    def __init__(self, rule_id, phase, check, needs=(), scan=False, trigger=''):
+        self.id = rule_id
+        self.phase = phase
+        self.check = check
+        self.needs = needs
+        self.scan = scan
+        self.trigger = trigger
+
+
+def line_starts(lines):
+    """
+    Offset of every line in the code, plus the end of the code + 1 (a setup
+    value of the rules that search the code between lines).
+    """
+    from itertools import accumulate
+    return list(accumulate((len(line) + 1 for line in lines), initial=0))
+
+
+def _rule_ids(value, key):
+    # enable/disable: a list of known rule ids
+    if not isinstance(value, (list, tuple, set, frozenset)):
+        raise ValueError(f"Rule '{key}' must be a list of rule ids")
+    unknown = [str(rule) for rule in value if not isinstance(rule, str) or rule not in KNOWN_RULES]
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(unknown)}")
+    return frozenset(value)
+
+
+def _options(value):
+    # options: known names with positive integer values
+    if not isinstance(value, dict):
+        raise ValueError("Rule 'options' must be an object")
+    unknown = [str(name) for name in value if name not in DEFAULT_OPTIONS]
+    if unknown:
+        raise ValueError(f"Unknown rule option(s): {', '.join(unknown)}. Valid options: {', '.join(DEFAULT_OPTIONS)}")
+    for name, option in value.items():
+        if isinstance(option, bool) or not isinstance(option, int) or option < 1:
+            raise ValueError(f"Rule option '{name}' must be a positive integer")
+    return dict(DEFAULT_OPTIONS, **value)
+
+
+class RuleSet:
+    """
+    Enabled rules and options. enable=None enables every rule; disable
+    removes rules from that set.
+    """
+    __slots__ = ('enable', 'disable', 'options', 'key')
+
+    def __init__(self, enable=None, disable=(), options=None):
+        self.enable = None if enable is None else _rule_ids(enable, 'enable')
+        self.disable = _rule_ids(disable, 'disable')
+        self.options = _options({} if options is None else options)
+        self.key = (self.enable, self.disable, tuple(sorted(self.options.items())))
+
+    def allows(self, rule_id):
+        return (self.enable is None or rule_id in self.enable) and rule_id not in self.disable
+
+    def filter(self, issues):
+        """
+        Drops the issues of disabled rules (for engines that are not compiled).
+        """
+        if self.enable is None and not self.disable:
+            return issues
+        return [issue for issue in issues if self.allows(issue.rule)]
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __getstate__(self):
+        return {'enable': self.enable, 'disable': self.disable, 'options': self.options}
+
+    def __setstate__(self, state):
+        self.__init__(state['enable'], state['disable'], state['options'])
+
+
+DEFAULT_RULES = RuleSet()
+
+
+def rule_set(config=None):
+    """
+    Normalizes a rule selection (None, a RuleSet or a dict with the optional
+    keys 'enable', 'disable' and 'options') to a RuleSet.
+    """
+    if config is None:
+        return DEFAULT_RULES
+    if isinstance(config, RuleSet):
+        return config
+    if not isinstance(config, dict):
+        raise ValueError("Rule configuration must be an object with 'enable', 'disable' and 'options'")
+    unknown = [key for key in config if key not in ('enable', 'disable', 'options')]
+    if unknown:
+        raise ValueError(f"Unknown rule configuration key(s): {', '.join(unknown)}")
+    disable = config.get('disable')
+    return RuleSet(config.get('enable'), () if disable is None else disable, config.get('options'))
+
+
+def load_rules(path):
+    """
+    RuleSet from a JSON config file:
+    {"disable": ["py-line-too-long"], "options": {"max_line_length": 100}}
+    """
+    import json
+    with open(path, encoding='utf-8') as f:
+        return rule_set(json.load(f))
+
+
+_modules = {}
+
+
+def _language_modules(language):
+    # Imports a language's rule modules on first use
+    modules = _modules.get(language)
+    if modules is None:
+        import importlib
+        modules = _modules[language] = [importlib.import_module(name, __name__) for name in LANGUAGE_MODULES[language]]
+    return modules
+
+
+def _setup_order(spec, needs):
+    # Setup names needed (with their own dependencies), in declaration order
+    wanted = set()
+    pending = list(needs)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(spec.SETUP[name][1])
+    return [name for name in spec.SETUP if name in wanted]
+
+
+def _build(spec, language, rules, options):
+    # Composes the enabled rules of one module into run(code, tree=None)
+    from operator import itemgetter
+    setup = [(name, spec.SETUP[name][0]) for name in _setup_order(spec, [need for rule in rules for need in rule.needs])]
+    phases = []
+    for phase, skip in spec.PHASES:
+        if phase in getattr(spec, 'PHASE_LANGUAGES', {}) and language not in spec.PHASE_LANGUAGES[phase]:
+            continue
+        ordered = list(enumerate(rule for rule in rules if rule.phase == phase))
+        if ordered:
+            phases.append((skip, [(order, rule.trigger, rule.check) for order, rule in ordered if not rule.scan],
+                           [(order, rule.check) for order, rule in ordered if rule.scan]))
+
+    def run(code, tree=None):
+        issues = []
+        lines = code.split('\n')
+        env = {'code': code, 'lines': lines, 'tree': tree, 'options': options}
+        for name, make in setup:
+            env[name] = make(env)
+        all_rows = None
+        for skip, makers, scans in phases:
+            checks = tuple((trigger, make(env)) for _, trigger, make in makers)
+            found = []
+            if checks:
+                if all_rows is None:
+                    all_rows = [(i, line, line.strip()) for i, line in enumerate(lines)]
+                rows = all_rows if skip is None else [row for row in all_rows if row[2] and not row[2].startswith(skip)]
+                # One loop over the lines for all the per-line checks of the
+                # phase, already in (line, rule) order
+                for i, line, stripped in rows:
+                    for trigger, check in checks:
+                        if trigger in stripped:
+                            issue = check(i, line, stripped)
+                            if issue is not None:
+                                found.append((i, check, issue))
+            if scans:
+                # Merged with the scan rules' issues, in rule order within a line
+                orders = {check: order for (trigger, check), (order, _, _) in zip(checks, makers)}
+                found = [(i, orders[check], issue) for i, check, issue in found]
+                for order, check in scans:
+                    found.extend((i, order, issue) for i, issue in check(env))
+                found.sort(key=itemgetter(0, 1))
+            issues.extend(map(itemgetter(2), found))
+        return issues
+    return run
+
+
+_pipelines = {}
+
+
+def compile_pipeline(language, rules=None):
+    """
+    Analysis function run(code, tree=None) -> issues for a language, made
+    of only the enabled rules. Cached per language and rule selection.
+    """
+    rules = rule_set(rules)
+    key = (language, rules.key)
+    run = _pipelines.get(key)
+    if run is None:
+        run = _pipelines[key] = _compile(language, rules)
+    return run
+
+
+def _compile(language, rules):
+    run = None
+    for spec in _language_modules(language):
+        enabled = [rule for rule in spec.RULES if rules.allows(rule.id)]
+        step = _build(spec, language, enabled, rules.options)
+        run = step if run is None else _chain(run, step)
+    return run
+
+
+def _chain(first, second):
+    # Pipelines of several modules of one language run one after the other
+    def run(code, tree=None):
+        return first(code, tree) + second(code, tree)
+    return run
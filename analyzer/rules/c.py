@@ -0,0 +1,177 @@
+"""
+Rules for C and C++ (see analyze_code / analyze_code_cpp).
+
+A rule's check is a function of env returning the per-line check(i, line,
+stripped) of its phase, which returns an Issue for line i or None (it is
+only called on lines containing the rule's trigger); env holds 'code',
+'lines', 'tree', 'options' and the setup values the rule needs. 'tree' is
+the brace-scope tree of the file (built only when a rule needs it). Scan
+rules (scan=True) only look at a few lines: their check is a generator
+check(env) yielding (i, issue) in line order.
+"""
+from ..c_scopes import build_c_scope_tree
+from ..issues import Issue
+from ..patterns import compiled
+from . import Rule, line_starts
+
+
+def _tree(env):
+    tree = env['tree']
+    return build_c_scope_tree(env['code']) if tree is None else tree
+
+
+# name -> (function of env, names it depends on); run before the loops when needed
+SETUP = {
+    'tree': (_tree, ()),
+    'dead_lines': (lambda env: env['tree'].unreachable_lines(), ('tree',)),
+    'assign_in_if': (lambda env: compiled('c_assign_in_if'), ()),
+    'format_spec': (lambda env: compiled('c_format_spec'), ()),
+    'int_decl': (lambda env: compiled('c_int_decl_lines'), ()),
+    'line_starts': (lambda env: line_starts(env['lines']), ()),
+}
+
+
+# Comment lines (empty lines are skipped too)
+COMMENT_PREFIXES = ('//', '/*')
+
+# (phase, prefixes of the non-empty lines it skips, or None to check every
+# line), in order
+PHASES = [('c', COMMENT_PREFIXES), ('cpp', None)]
+
+# The C++ checks run after the C checks, for C++ only
+PHASE_LANGUAGES = {'cpp': ("C++",)}
+
+
+# Style/Lint: Check for 'void main' (Standard compliance)
+def void_main(env):
+    def check(i, line, stripped):
+        if 'void main' in stripped:
+            return Issue('c-void-main', i + 1)
+    return check
+
+
+# Dead Code Detection (code after a return statement in the same block)
+def unreachable(env):
+    lines = env['lines']
+    for line_num in sorted(env['dead_lines']):
+        stripped = lines[line_num - 1].strip()
+        if stripped and not stripped.startswith(COMMENT_PREFIXES):
+            yield line_num - 1, Issue('c-unreachable', line_num, stripped)
+
+
+# Infinite Loop Detection (Heuristic): while(1), while(true), for(;;)
+def infinite_loop(env):
+    def check(i, line, stripped):
+        compact = stripped.replace(" ", "")
+        if 'while(1)' in compact or 'while(true)' in compact or 'for(;;)' in compact:
+            return Issue('c-infinite-loop', i + 1)
+    return check
+
+
+def division_by_zero(env):
+    def check(i, line, stripped):
+        if '/ 0' in stripped or '/0' in stripped:
+            return Issue('c-division-by-zero', i + 1)
+    return check
+
+
+# Assignment in Condition (e.g. if (x = 5)): '=' but not ==, !=, <=, >=
+def assign_in_condition(env):
+    assign_in_if = env['assign_in_if']
+    def check(i, line, stripped):
+        if 'if (' in stripped or 'if(' in stripped:
+            if assign_in_if.search(stripped):
+                return Issue('c-assign-in-condition', i + 1)
+    return check
+
+
+# Security: Unsafe Functions
+def gets(env):
+    def check(i, line, stripped):
+        if 'gets(' in stripped:
+            return Issue('c-gets', i + 1, column=line.find('gets(') + 1)
+    return check
+
+
+def strcpy(env):
+    def check(i, line, stripped):
+        if 'strcpy(' in stripped:
+            return Issue('c-strcpy', i + 1, column=line.find('strcpy(') + 1)
+    return check
+
+
+# printf format specifiers vs. commas outside the string (heuristic)
+def printf_mismatch(env):
+    format_spec = env['format_spec']
+    def check(i, line, stripped):
+        if 'printf' in stripped:
+            format_matches = format_spec.findall(stripped)
+            args_count = stripped.count(',')
+            if len(format_matches) > args_count:
+                return Issue('c-printf-mismatch', i + 1, len(format_matches))
+    return check
+
+
+# Uninitialized 'int x;' used before '=' in the enclosing function scope
+# (file-scope variables are zero-initialized). The declaration lines are
+# found with one search over the code, after a newline put in front of it,
+# and the first use and assignment with one search each over the lines
+# after the declaration up to the end of its scope (names never contain a
+# newline, so the first line holding one is where it is found).
+def uninitialized(env):
+    tree, code, starts = env['tree'], env['code'], env['line_starts']
+    last_line = len(env['lines'])
+    text = '\n' + code
+    i = 0
+    pos = 0
+    for decl_match in env['int_decl'].finditer(text):
+        i += text.count('\n', pos, decl_match.start())
+        pos = decl_match.start()
+        scope = tree.scope_at(i + 1)
+        if scope.named().kind == 'function':
+            var_name = decl_match.group(1)
+            end_line = min(scope.end_line, last_line)
+            if end_line <= i + 1:
+                continue
+            start, end = starts[i + 1], starts[end_line] - 1
+            used = _find_word(code, var_name, start, end)
+            if used != -1:
+                j = i + 1 + code.count('\n', start, used)
+                assigned = code.find(f"{var_name} =", start, end)
+                if assigned == -1 or i + 1 + code.count('\n', start, assigned) > j:
+                    yield i, Issue('c-uninitialized', j + 1, var_name)
+
+
+def _find_word(code, word, start, end):
+    # Offset of the first occurrence of word in code[start:end] that is not
+    # part of a longer word (like re's r'\bword\b'), or -1
+    pos = code.find(word, start, end)
+    while pos != -1:
+        after = pos + len(word)
+        if not (pos and (code[pos - 1].isalnum() or code[pos - 1] == '_')) \
+                and not (after < end and (code[after].isalnum() or code[after] == '_')):
+            return pos
+        pos = code.find(word, pos + 1, end)
+    return -1
+
+
+# C++: raw pointers
+def raw_new(env):
+    def check(i, line, stripped):
+        if '*' in stripped and 'new ' in stripped and 'auto ' not in stripped:
+            return Issue('cpp-raw-new', i + 1)
+    return check
+
+
+RULES = [
+    Rule('c-void-main', 'c', void_main, trigger='void main'),
+    Rule('c-unreachable', 'c', unreachable, needs=('dead_lines',), scan=True),
+    Rule('c-infinite-loop', 'c', infinite_loop, trigger='('),
+    Rule('c-division-by-zero', 'c', division_by_zero, trigger='/'),
+    Rule('c-assign-in-condition', 'c', assign_in_condition, needs=('assign_in_if',), trigger='if'),
+    Rule('c-gets', 'c', gets, trigger='gets('),
+    Rule('c-strcpy', 'c', strcpy, trigger='strcpy('),
+    Rule('c-printf-mismatch', 'c', printf_mismatch, needs=('format_spec',), trigger='printf'),
+    Rule('c-uninitialized', 'c', uninitialized, needs=('int_decl', 'line_starts', 'tree'), scan=True),
+    Rule('cpp-raw-new', 'cpp', raw_new, trigger='new '),
+]
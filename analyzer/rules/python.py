@@ -0,0 +1,179 @@
+"""
+Line-engine rules for Python (see analyze_code_python).
+
+A rule's check is a function of env returning the per-line check(i, line,
+stripped) of its phase, which returns an Issue for line i or None (it is
+only called on lines containing the rule's trigger); env holds 'code',
+'lines', 'tree', 'options' and the setup values the rule needs. Scan
+rules (scan=True) read more than their line, or only a few lines: their
+check is a generator check(env) yielding (i, issue) in line order.
+"""
+from ..issues import Issue
+from ..line_metrics import line_metrics
+from ..patterns import compiled
+from . import Rule, line_starts
+
+# name -> (function of env, names it depends on); run before the loops when needed
+SETUP = {
+    'def_name': (lambda env: compiled('py_def_name'), ()),
+    'line_starts': (lambda env: line_starts(env['lines']), ()),
+    'metrics': (lambda env: line_metrics(env['code']), ()),
+    'trailing_lines': (lambda env: env['metrics'].trailing_whitespace_lines(), ('metrics',)),
+    'long_lines': (lambda env: env['metrics'].long_lines(env['options']['max_line_length']), ('metrics',)),
+}
+
+# 1. Syntax Analysis (Structure), 2. Semantic & Runtime Analysis; every
+# line is checked in both
+PHASES = [('syntax', None), ('semantic', None)]
+
+
+def missing_colon(env):
+    def check(i, line, stripped):
+        if (stripped.startswith('if ') or stripped.startswith('def ') or stripped.startswith('for ') or stripped.startswith('while ')) and not stripped.endswith(':'):
+            return Issue('py-missing-colon', i + 1)
+    return check
+
+
+def division_by_zero(env):
+    def check(i, line, stripped):
+        if '/ 0' in stripped and 'print' not in stripped:
+            return Issue('py-division-by-zero', i + 1)
+    return check
+
+
+# Whole-file rules: they look at every other line of the file. Names never
+# contain a newline, so "in one of these lines" is a find over the code
+# between their offsets.
+def unused_variable(env):
+    code, starts = env['code'], env['line_starts']
+    for i, line in enumerate(env['lines']):
+        if '=' not in line:
+            continue
+        stripped = line.strip()
+        if not stripped.startswith('def') and 'if' not in stripped:
+            var_name = stripped.split('=')[0].strip()
+            if var_name.isidentifier():
+                # Used in a later line
+                is_used = code.find(var_name, starts[i + 1]) != -1
+                if not is_used and var_name != 'x':
+                    yield i, Issue('py-unused-variable', i + 1, var_name)
+
+
+def unused_import(env):
+    code, starts = env['code'], env['line_starts']
+    last = len(starts) - 2
+    for i, line in enumerate(env['lines']):
+        if 'import ' not in line:
+            continue
+        stripped = line.strip()
+        if stripped.startswith('import '):
+            parts = stripped.replace('import ', '').split(',')
+            for part in parts:
+                alias = part.strip().split(' as ')[-1]
+                # Used in a line before or after this one
+                is_used = (i > 0 and code.find(alias, 0, starts[i] - 1) != -1) \
+                    or (i < last and code.find(alias, starts[i + 1]) != -1)
+                if not is_used:
+                    yield i, Issue('py-unused-import', i + 1, alias)
+
+
+# The parallel mode analyzes each chunk of a file as if it were the whole
+# file; the reduce step then drops the whole-file issues whose name is used
+# in the other chunks the rule looks into: the later ones, and also the
+# earlier ones when this is True (see parallel.analyze_parallel)
+FILE_RULE_LOOKS_BACK = {'py-unused-variable': False, 'py-unused-import': True}
+
+
+def bool_comparison(env):
+    def check(i, line, stripped):
+        if '== True' in stripped or '== False' in stripped:
+            return Issue('py-bool-comparison', i + 1)
+    return check
+
+
+def trailing_whitespace(env):
+    for line_num in sorted(env['trailing_lines']):
+        yield line_num - 1, Issue('py-trailing-whitespace', line_num)
+
+
+def while_true(env):
+    def check(i, line, stripped):
+        if 'while True:' in stripped:
+            return Issue('py-while-true', i + 1)
+    return check
+
+
+def bare_except(env):
+    def check(i, line, stripped):
+        if stripped.replace(" ", "") == "except:":
+            return Issue('py-bare-except', i + 1)
+    return check
+
+
+def use_of_eval(env):
+    def check(i, line, stripped):
+        if 'eval(' in stripped:
+            return Issue('py-eval', i + 1)
+    return check
+
+
+def line_too_long(env):
+    column = env['options']['max_line_length'] + 1
+    for line_num in sorted(env['long_lines']):
+        yield line_num - 1, Issue('py-line-too-long', line_num, column=column)
+
+
+def function_name(env):
+    def_name = env['def_name']
+    def check(i, line, stripped):
+        if 'def ' in stripped:
+            match = def_name.search(stripped)
+            if match:
+                func_name = match.group(1)
+                if any(x.isupper() for x in func_name):
+                    return Issue('py-function-name', i + 1, func_name)
+    return check
+
+
+def use_of_global(env):
+    def check(i, line, stripped):
+        if 'global ' in stripped:
+            return Issue('py-global', i + 1)
+    return check
+
+
+def multiple_imports(env):
+    def check(i, line, stripped):
+        if stripped.startswith('import ') and ',' in stripped:
+            return Issue('py-multiple-imports', i + 1)
+    return check
+
+
+# Checks the next line for a docstring
+def missing_docstring(env):
+    lines = env['lines']
+    def check(i, line, stripped):
+        if 'def ' in stripped and stripped.endswith(':'):
+            if i + 1 < len(lines):
+                next_line = lines[i+1].strip()
+                if not (next_line.startswith('"""') or next_line.startswith("'''")):
+                    return Issue('py-missing-docstring', i + 1)
+    return check
+
+
+RULES = [
+    Rule('py-missing-colon', 'syntax', missing_colon),
+    Rule('py-division-by-zero', 'semantic', division_by_zero, trigger='/ 0'),
+    Rule('py-unused-variable', 'semantic', unused_variable, needs=('line_starts',), scan=True),
+    Rule('py-unused-import', 'semantic', unused_import, needs=('line_starts',), scan=True),
+    Rule('py-bool-comparison', 'semantic', bool_comparison, trigger='== '),
+    Rule('py-trailing-whitespace', 'semantic', trailing_whitespace, needs=('trailing_lines',), scan=True),
+    Rule('py-while-true', 'semantic', while_true, trigger='while True:'),
+    Rule('py-bare-except', 'semantic', bare_except, trigger=':'),
+    Rule('py-eval', 'semantic', use_of_eval, trigger='eval('),
+    Rule('py-line-too-long', 'semantic', line_too_long, needs=('long_lines',), scan=True),
+    Rule('py-function-name', 'semantic', function_name, needs=('def_name',), trigger='def '),
+    Rule('py-global', 'semantic', use_of_global, trigger='global '),
+    Rule('py-multiple-imports', 'semantic', multiple_imports, trigger='import '),
+    Rule('py-missing-docstring', 'semantic', missing_docstring, trigger='def '),
+]
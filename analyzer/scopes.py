@@ -0,0 +1,159 @@
+"""
+Python scope tree.
+
+Built once per file during the single walk of the AST engine
+(see python_ast.py). Each scope keeps hash maps of the names it defines and
+references; after the walk every reference is resolved to the scope that
+defines it, so "where is X defined" and "who uses X" are dict lookups.
+"""
+
+
+class Scope:
+    """
+    A module, class, function, lambda or comprehension scope.
+    """
+    __slots__ = ('kind', 'name', 'parent', 'children', 'line',
+                 'definitions', 'references', 'users', 'global_names', 'nonlocal_names')
+
+    def __init__(self, kind, name, parent=None, line=0):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.line = line
+        self.definitions = {}     # name -> [(line, kind)] bound in this scope
+        self.references = {}      # name -> [line] read in this scope
+        self.users = {}           # name -> [(scope, line)] reads resolved to this scope's binding
+        self.global_names = set()
+        self.nonlocal_names = set()
+        if parent is not None:
+            parent.children.append(self)
+
+    @property
+    def qualified_name(self):
+        """
+        Dotted name of the scope, 'global' for the module.
+        """
+        if self.parent is None:
+            return 'global'
+        names = []
+        scope = self
+        while scope.parent is not None:
+            names.append(scope.name)
+            scope = scope.parent
+        return '.'.join(reversed(names))
+
+    def __repr__(self):
+        return f"Scope({self.kind}, {self.qualified_name!r})"
+
+
+class ScopeTree:
+    """
+    Scope tree of one file with name indexes across all scopes.
+    """
+    def __init__(self):
+        self.root = Scope('module', '<module>')
+        self.scopes = [self.root]
+        self.defined = {}    # name -> [(scope, line, kind)]
+        self.used = {}       # name -> [(scope, line)]
+        self._pending = []   # references waiting for resolution
+
+    def new_scope(self, kind, name, parent, line):
+        scope = Scope(kind, name, parent, line)
+        self.scopes.append(scope)
+        return scope
+
+    def declare(self, scope, name, kind):
+        # 'global'/'nonlocal' statements redirect later bindings of the name
+        if kind == 'global':
+            scope.global_names.add(name)
+        else:
+            scope.nonlocal_names.add(name)
+
+    def bind(self, scope, name, line, kind='variable'):
+        """
+        Records a definition of name, honouring global/nonlocal declarations.
+        """
+        target = self.binding_scope(scope, name)
+        target.definitions.setdefault(name, []).append((line, kind))
+        self.defined.setdefault(name, []).append((target, line, kind))
+        return target
+
+    def use(self, scope, name, line):
+        scope.references.setdefault(name, []).append(line)
+        self.used.setdefault(name, []).append((scope, line))
+        self._pending.append((scope, name, line))
+
+    def finalize(self):
+        """
+        Resolves every reference to its defining scope (LEGB, skipping
+        enclosing class scopes). Called once after the walk.
+        """
+        for scope, name, line in self._pending:
+            target = self.resolve(scope, name)
+            if target is not None:
+                target.users.setdefault(name, []).append((scope, line))
+        self._pending = []
+        return self
+
+    def binding_scope(self, scope, name):
+        """
+        Returns the scope a binding of name in 'scope' lands in.
+        """
+        if name in scope.global_names:
+            return self.root
+        if name in scope.nonlocal_names:
+            enclosing = scope.parent
+            while enclosing is not None and enclosing.kind not in ('function', 'lambda'):
+                enclosing = enclosing.parent
+            return enclosing or self.root
+        return scope
+
+    def resolve(self, scope, name):
+        """
+        Returns the scope whose binding 'name' refers to from 'scope', or
+        None for builtins and undefined names.
+        """
+        if name in scope.global_names:
+            return self.root if name in self.root.definitions else None
+        current = self.binding_scope(scope, name)
+        if name in current.definitions:
+            return current
+        current = current.parent
+        while current is not None:
+            if current.kind != 'class' and name in current.definitions:
+                return current
+            current = current.parent
+        return None
+
+    # --- Queries (dict lookups) ---
+
+    def where_defined(self, name):
+        """
+        Returns [(scope qualified name, line, kind)] for every binding of name.
+        """
+        return [(scope.qualified_name, line, kind) for scope, line, kind in self.defined.get(name, ())]
+
+    def who_uses(self, name):
+        """
+        Returns [(scope qualified name, line)] for every read of name.
+        """
+        return [(scope.qualified_name, line) for scope, line in self.used.get(name, ())]
+
+    def is_used(self, scope, name):
+        """
+        True if any reference resolves to the binding of name in scope.
+        """
+        return name in scope.users
+
+    def unused(self, kinds=('variable',)):
+        """
+        Yields (scope, name, line, kind) for bindings nothing refers to.
+        """
+        for scope in self.scopes:
+            for name, bindings in scope.definitions.items():
+                if name in scope.users:
+                    continue
+                for line, kind in bindings:
+                    if kind in kinds:
+                        yield scope, name, line, kind
@@ -0,0 +1,119 @@
+from .c_scopes import build_c_scope_tree
+from .patterns import compiled
+
+def semantic_analysis_symbol_table(code, language="Python", engine="lines", tree=None):
+    """
+    Phase 3: Semantic Analysis (Symbol Table Generation)
+    Tracks variable declarations, types (inferred), and scope.
+    For Python, engine="ast" reuses the single AST walk of the analysis engine.
+    For C/C++, tree is an already built scope tree of the code.
+    """
+    if language == "Python" and engine == "ast":
+        from . import python_ast
+        result = python_ast.analyze(code)
+        if result is not None:
+            return list(result.symbols)
+
+    symbol_table = []
+    lines = code.split('\n')
+    
+    if language == "Python":
+        # Scope stack of (indent, qualified name); a line at or left of a
+        # scope's header indent closes that scope
+        scope_stack = [(-1, "global")]
+        for i, line in enumerate(lines):
+            line_num = i + 1
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+
+            indent = len(line) - len(line.lstrip())
+            while scope_stack[-1][0] >= indent:
+                scope_stack.pop()
+            current_scope = scope_stack[-1][1]
+            
+            # Scope detection (def/class headers open a nested scope)
+            if stripped.startswith('def ') or stripped.startswith('class '):
+                kind, header = stripped.split(None, 1)
+                name = header.split('(')[0].split(':')[0].strip()
+                symbol_table.append({'name': name, 'type': 'FUNCTION' if kind == 'def' else 'CLASS', 'scope': current_scope, 'line': line_num})
+                qualified = name if current_scope == "global" else f"{current_scope}.{name}"
+                scope_stack.append((indent, qualified))
+                continue
+            
+            # Variable declaration (Assignment)
+            if '=' in stripped and '==' not in stripped:
+                parts = stripped.split('=')
+                var_name = parts[0].strip()
+                val_part = parts[1].strip()
+                
+                # Simple Type Inference
+                inferred_type = "UNKNOWN"
+                if val_part.isdigit(): inferred_type = "INTEGER"
+                elif val_part.replace('.', '', 1).isdigit(): inferred_type = "FLOAT"
+                elif val_part.startswith('"') or val_part.startswith("'"): inferred_type = "STRING"
+                elif val_part == "True" or val_part == "False": inferred_type = "BOOLEAN"
+                
+                if var_name.isidentifier():
+                    symbol_table.append({
+                        'name': var_name,
+                        'type': f"VARIABLE ({inferred_type})",
+                        'scope': current_scope,
+                        'line': line_num
+                    })
+    elif language in ["C", "C++"]:
+         var_decl = compiled('c_var_decl')
+         func_header = compiled('c_func_header')
+         func_name_re = compiled('c_func_name')
+
+         # Scopes come from the brace-scope tree, built once for the file
+         if tree is None:
+             tree = build_c_scope_tree(code)
+         definitions = {}
+         for scope in tree.scopes:
+             if scope.kind in ('function', 'struct'):
+                 definitions.setdefault(scope.line, []).append(scope)
+
+         # Only the lines starting with a type can declare something: they
+         # are found with one search over the code, after a newline put in
+         # front of it, and visited in order with the definition lines
+         text = '\n' + code
+         candidates = set(definitions)
+         i = 0
+         pos = 0
+         for match in compiled('c_type_lines').finditer(text):
+            i += text.count('\n', pos, match.start())
+            pos = match.start()
+            candidates.add(i + 1)
+
+         for line_num in sorted(candidates):
+            stripped = lines[line_num - 1].strip()
+            # C/C++ Declarations: int x = 5; or int x;
+            # Regex for type followed by var
+            match = var_decl.match(stripped)
+            if match:
+                var_type = match.group(1)
+                var_name = match.group(2)
+                symbol_table.append({
+                    'name': var_name,
+                    'type': f"VARIABLE ({var_type.upper()})",
+                    'scope': tree.scope_name_at(line_num),
+                    'line': line_num
+                })
+            
+            # Function/struct definitions (with a body)
+            if line_num in definitions:
+                for scope in definitions[line_num]:
+                    symbol_table.append({
+                        'name': scope.name,
+                        'type': 'FUNCTION' if scope.kind == 'function' else 'STRUCT',
+                        'scope': scope.parent.named().name,
+                        'line': line_num
+                    })
+            # Function prototypes (basic)
+            elif func_header.match(stripped) and stripped.endswith(';'):
+                func_match = func_name_re.search(stripped)
+                if func_match:
+                    symbol_table.append({'name': func_match.group(1), 'type': 'FUNCTION', 'scope': tree.scope_name_at(line_num), 'line': line_num})
+                
+    return symbol_table
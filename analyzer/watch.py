@@ -0,0 +1,166 @@
+"""
+Watch mode: polls a directory tree and re-analyzes only the files that changed.
+
+A file is considered changed when its mtime or size differ from the last
+poll and its content hash differs too (touching a file, or saving it
+unchanged, costs one hash and no analysis). Results are cached by content
+hash and language, so reverting a file is free. Changed files are analyzed on a process
+pool and each poll reports the issues that appeared and disappeared.
+"""
+import hashlib
+import os
+
+from .files import analyze_file, iter_source_files, language_for
+
+# Results kept for content that is no longer on disk (e.g. to make undo free)
+MAX_CACHED_RESULTS = 1024
+
+
+def _analyze_path(path, engine, rules):
+    # None if the file was deleted or became unreadable since the scan
+    try:
+        return analyze_file(path, engine, rules)
+    except OSError:
+        return None
+
+
+def content_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IssueDelta:
+    """
+    Change of one file's issues between two polls.
+    """
+    __slots__ = ('path', 'added', 'resolved', 'removed_file')
+
+    def __init__(self, path, added, resolved, removed_file=False):
+        self.path = path
+        self.added = added
+        self.resolved = resolved
+        self.removed_file = removed_file
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'added': [issue.to_dict() for issue in self.added],
+            'resolved': [issue.to_dict() for issue in self.resolved],
+            'removed_file': self.removed_file,
+        }
+
+
+def _diff(old, new):
+    # Issues are compared as (rule, line, column, args) multisets
+    from collections import Counter
+    unmatched = Counter(old)
+    added = []
+    for issue in new:
+        if unmatched[issue]:
+            unmatched[issue] -= 1
+        else:
+            added.append(issue)
+    resolved = []
+    for issue in old:
+        if unmatched[issue]:
+            unmatched[issue] -= 1
+            resolved.append(issue)
+    return added, resolved
+
+
+class Watcher:
+    """
+    Polling watcher over a file or directory tree.
+    """
+    def __init__(self, root, workers=None, engine="lines", rules=None):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.rules = rules
+        self.files = {}      # path -> (mtime_ns, size, content hash)
+        self.issues = {}     # path -> issues of its current content
+        self.results = {}    # (content hash, language) -> issues
+
+    def changed_files(self):
+        """
+        Returns ([(path, content hash)] of new/modified files, [removed paths]).
+        """
+        changed = []
+        seen = set()
+        for path in iter_source_files(self.root):
+            try:
+                st = os.stat(path)
+                previous = self.files.get(path)
+                unchanged = previous is not None and previous[:2] == (st.st_mtime_ns, st.st_size)
+                digest = previous[2] if unchanged else content_hash(path)
+            except OSError: # deleted or unreadable between listing and reading
+                continue # dropped below like any removed file
+            seen.add(path)
+            if unchanged:
+                continue
+            self.files[path] = (st.st_mtime_ns, st.st_size, digest)
+            if previous is None or previous[2] != digest:
+                changed.append((path, digest))
+        removed = [path for path in self.files if path not in seen]
+        for path in removed:
+            del self.files[path]
+        return changed, removed
+
+    def _analyze(self, paths):
+        # Runs the analyzers, in the pool when more than one file changed
+        if len(paths) == 1 or self.workers < 2:
+            return [_analyze_path(path, self.engine, self.rules) for path in paths]
+        from .parallel import get_pool
+        pool = get_pool(self.workers)
+        return list(pool.map(_analyze_path, paths, [self.engine] * len(paths), [self.rules] * len(paths)))
+
+    def poll(self):
+        """
+        Checks the tree once and returns the IssueDeltas of changed files.
+        """
+        changed, removed = self.changed_files()
+        deltas = [IssueDelta(path, [], self.issues.pop(path, []), removed_file=True) for path in removed]
+
+        # The same content is analyzed as a different language in a .py and a .c file
+        changed = [(path, (digest, language_for(path))) for path, digest in changed]
+        pending = [(path, key) for path, key in changed if key not in self.results]
+        vanished = set()
+        if pending:
+            if len(self.results) + len(pending) > MAX_CACHED_RESULTS:
+                self.results.clear()
+            for (path, key), issues in zip(pending, self._analyze([path for path, _ in pending])):
+                if issues is None:
+                    vanished.add(path)
+                else:
+                    self.results[key] = issues
+
+        for path, key in changed:
+            new = self.results.get(key)
+            if new is None and path not in vanished: # evicted above, analyze again
+                new = _analyze_path(path, self.engine, self.rules)
+                if new is not None:
+                    self.results[key] = new
+            if new is None:
+                # Deleted or unreadable since the scan: reported as removed
+                self.files.pop(path, None)
+                deltas.append(IssueDelta(path, [], self.issues.pop(path, []), removed_file=True))
+                continue
+            added, resolved = _diff(self.issues.get(path, []), new)
+            self.issues[path] = new
+            if added or resolved:
+                deltas.append(IssueDelta(path, added, resolved))
+        return deltas
+
+    def watch(self, interval=0.5, report=None):
+        """
+        Polls forever, calling report(deltas) after every poll that found changes.
+        """
+        import time
+        while True:
+            deltas = self.poll()
+            if deltas and report is not None:
+                report(deltas)
+            time.sleep(interval)
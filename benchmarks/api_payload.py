@@ -0,0 +1,120 @@
+"""
+Bandwidth/latency benchmark for the Flask /analyze endpoint.
+
+Posts a generated Python file through Flask's test client with different
+response options and reports, for each, the response size on the wire and
+the median server round-trip time (analysis + serialization + compression,
+plus client-side decompression and JSON parsing).
+
+    baseline   stdlib json, token objects, no compression (the old behaviour)
+    json       fast JSON encoder (orjson when installed)
+    gzip       fast JSON + gzip
+    zstd       fast JSON + zstd (only when 'zstandard' is installed)
+    columns    fast JSON + gzip/zstd + columnar tokens
+
+Usage:
+    python benchmarks/api_payload.py [--lines 20000] [--runs 5]
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, 'using_Flask')]
+
+SAMPLE = '''import os, sys
+
+def ProcessData(data, items=[]):
+    global counter
+    total = 0
+    for item in items:
+        if item == True:
+            total += item / 2
+    print("total", total)
+    return total
+'''
+
+
+def make_code(lines):
+    """
+    Repeats the sample until the file has about the given number of lines.
+    """
+    return SAMPLE * max(1, lines // SAMPLE.count('\n'))
+
+
+def decode(response):
+    encoding = response.headers.get('Content-Encoding')
+    body = response.data
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'zstd':
+        import zstandard
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return json.loads(body)
+
+
+def run_case(client, transport, code, case, runs):
+    fast_json = transport.orjson
+    if case['stdlib_json']:
+        transport.orjson = None
+    try:
+        payload = {'code': code, 'language': 'Python'}
+        if case['columns']:
+            payload['token_format'] = 'columns'
+        headers = {'Accept-Encoding': case['accept']} if case['accept'] else {}
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            response = client.post('/analyze', json=payload, headers=headers)
+            decode(response)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        transport.orjson = fast_json
+    return {
+        'bytes': len(response.data),
+        'encoding': response.headers.get('Content-Encoding', 'identity'),
+        'median_ms': round(statistics.median(timings), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    import app
+    import transport
+    client = app.app.test_client()
+    code = make_code(args.lines)
+
+    cases = {
+        'baseline': {'stdlib_json': True, 'accept': '', 'columns': False},
+        'json': {'stdlib_json': False, 'accept': '', 'columns': False},
+        'gzip': {'stdlib_json': False, 'accept': 'gzip', 'columns': False},
+    }
+    if transport.zstandard is not None:
+        cases['zstd'] = {'stdlib_json': False, 'accept': 'gzip, zstd', 'columns': False}
+    cases['columns'] = {'stdlib_json': False, 'accept': 'gzip, zstd', 'columns': True}
+
+    report = {
+        'lines': code.count('\n'),
+        'request_bytes': len(code),
+        'orjson': transport.orjson is not None,
+        'zstandard': transport.zstandard is not None,
+        'runs': args.runs,
+        'cases': {name: run_case(client, transport, code, case, args.runs) for name, case in cases.items()},
+    }
+    baseline = report['cases']['baseline']
+    for result in report['cases'].values():
+        result['size_ratio'] = round(result['bytes'] / baseline['bytes'], 3)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
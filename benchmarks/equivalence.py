@@ -0,0 +1,475 @@
+"""
+Differential equivalence harness for the analysis engines.
+
+Runs a reference and a candidate implementation of the public functions
+(lexical_analysis, semantic_analysis_symbol_table, analyze_code,
+analyze_code_cpp, analyze_code_python, refactor_code, refactor_code_cpp,
+refactor_code_python, remove_comments) side by side over a generated and
+fuzzed corpus of C, C++ and Python files, and compares tokens, issues,
+symbol tables and refactored text. Every mismatching input is shrunk to a
+minimal reproducer (delta debugging over lines, then characters). The JSON
+report gives, per function, the inputs run, the mismatches with their
+reproducers and the candidate's speedup over the reference.
+
+An engine is SOURCE[+VARIANT...]:
+    tree                  the analyzer package of the working tree
+    git:REV[:PATH]        a package or module at a git revision, e.g.
+                          git:e040bf6:using_Flask/analyzer.py (the original
+                          single-module analyzer)
+    DIR or FILE.py        a package directory or module on disk
+and the variants select the optimized paths of the package:
+    parallel=N            analyze_code* and lexical_analysis with workers=N
+                          (only files of twice parallel.MIN_CHUNK_LINES or more
+                          are split, see --large; issues come ordered by line,
+                          see --unordered)
+    incremental           refactor_code_python(incremental=True)
+    edits                 refactorers with edits=True, applied with apply_edits
+    mmap                  lexical_analysis through lex_file() on a temp file
+    ast                   Python issues and symbols with the AST engine
+
+Outputs are compared on the keys of the reference's records, so a candidate
+may add fields (e.g. token columns) unless --strict is given; --unordered
+compares issue lists regardless of order. Exceptions are outputs too: both
+sides must raise the same exception type.
+
+Usage:
+    python benchmarks/equivalence.py [--reference tree] [--candidate tree+incremental+edits+mmap]
+        [--generated 200] [--fuzzed 400] [--large 0] [--functions NAME...] [--seed 0]
+    python benchmarks/equivalence.py --candidate tree+parallel=4 --large 2 --unordered
+"""
+import argparse
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# function -> languages it is run for
+FUNCTIONS = {
+    'lexical_analysis': ('Python', 'C', 'C++'),
+    'semantic_analysis_symbol_table': ('Python', 'C', 'C++'),
+    'analyze_code': ('C',),
+    'analyze_code_cpp': ('C++',),
+    'analyze_code_python': ('Python',),
+    'refactor_code': ('C',),
+    'refactor_code_cpp': ('C++',),
+    'refactor_code_python': ('Python',),
+    'remove_comments': ('Python', 'C', 'C++'),
+}
+
+VARIANTS = ('parallel', 'incremental', 'edits', 'mmap', 'ast')
+
+# Building blocks of the generated corpus, each exercising some rules
+SNIPPETS = {
+    'Python': [
+        'import os, sys\n',
+        'import json as js\n',
+        'def ProcessData(data, items=[]):\n    total = 0\n    return total\n',
+        'def helper(x):\n    """Doc."""\n    return x / 0\n',
+        'def no_colon(x)\n    pass\n',
+        'class Thing:\n    def method(self):\n        self.value = 1\n',
+        'counter = 0\n',
+        'unused_value = compute()\n',
+        'result = eval("1 + 2")\n',
+        'while True:\n    break\n',
+        'try:\n    pass\nexcept:\n    pass\n',
+        'if flag == True:\n    print("yes")\n',
+        'def set_global():\n    global counter\n    counter += 1\n',
+        '# ' + 'a long comment that keeps going ' * 4 + '\n',
+        'value = 1   \n',
+        'text = """multi\nline # not a comment\nstring"""\n',
+        "name = 'it''s' # comment\n",
+        '@decorator\ndef Decorated():\n    pass\n',
+        'for i in range(10):\n    total = i / 2\n',
+        'lambda_value = (lambda y: y)(3)\n',
+        'x = 1\n',
+        'café = "unicode"\n',
+    ],
+    'C': [
+        '#include <stdio.h>\n',
+        '#include "local.h"\n',
+        'void main() {\n    return;\n}\n',
+        'int main() {\n    int x;\n    printf("%d\\n", x);\n    return 0;\n}\n',
+        'int f(int n) {\n    if (n = 0) {\n        return 1;\n    }\n    return n / 0;\n}\n',
+        'void g() {\n    char buf[8];\n    gets(buf);\n    strcpy(buf, "a");\n}\n',
+        'void loop() {\n    while (1) {\n    }\n    for (;;) {}\n}\n',
+        'int h() {\n    return 2;\n    h();\n}\n',
+        '/* block\n   comment { */\n',
+        '// line comment }\n',
+        'struct point { int x; int y; };\n',
+        'static float ratio = 1.5;\n',
+        'const char *s = "brace { in string";\n',
+        'double area(double r) { return 3.14 * r * r; }\n',
+        'int counter;\n',
+        'void fmt() { printf("%d %s %f\\n", 1); }\n',
+    ],
+    'C++': [
+        '#include <iostream>\n',
+        'class Holder {\npublic:\n    int *p = new int(5);\n    int get() { return *p; }\n};\n',
+        'namespace ns {\n    int value = 0;\n}\n',
+        'template <typename T> T twice(T v) { return v * 2; }\n',
+        'auto *q = new Holder();\n',
+        'bool ok = true;\n',
+    ],
+}
+
+# Characters the fuzzer inserts: the ones the analyzers react to
+FUZZ_CHARS = '{}()[];:,"\'#/*\\=<>!%.\n\t _xX0é'
+
+
+def _engine_source(source):
+    # Module or package of an engine SOURCE (see the module docstring)
+    if source == 'tree':
+        sys.path.insert(0, REPO_ROOT)
+        import analyzer
+        return analyzer
+    if source.startswith('git:'):
+        import subprocess
+        import tarfile
+        rev, _, path = source[4:].partition(':')
+        path = path or 'analyzer'
+        archive = subprocess.run(['git', 'archive', '--format=tar', rev, path], cwd=REPO_ROOT,
+                                 capture_output=True, check=True).stdout
+        directory = tempfile.mkdtemp(prefix='equivalence-')
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            if hasattr(tarfile, 'data_filter'):
+                tar.extractall(directory, filter='data')
+            else:
+                tar.extractall(directory)
+        source = os.path.join(directory, path)
+    return _load_path(source)
+
+
+_loaded = []
+
+
+def _load_path(path):
+    # Imports a package directory or module file under a unique name, so
+    # several versions of the analyzer can be loaded side by side
+    name = f'_equivalence_{len(_loaded)}'
+    if os.path.isdir(path):
+        spec = importlib.util.spec_from_file_location(name, os.path.join(path, '__init__.py'),
+                                                      submodule_search_locations=[path])
+    else:
+        spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None:
+        raise SystemExit(f"Cannot load an analyzer from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    _loaded.append(module)
+    return module
+
+
+class Engine:
+    """
+    One side of the comparison: a loaded analyzer and the variants that
+    select how its functions are called.
+    """
+    def __init__(self, spec):
+        source, *variants = spec.split('+')
+        self.spec = spec
+        self.options = {}
+        for variant in variants:
+            name, _, value = variant.partition('=')
+            if name not in VARIANTS:
+                raise ValueError(f"Unknown variant '{name}' (valid: {', '.join(VARIANTS)})")
+            self.options[name] = int(value) if value else True
+        self.module = _engine_source(source)
+        self._temp = None
+
+    def supports(self, function):
+        return hasattr(self.module, function)
+
+    def call(self, function, code, language):
+        module, options = self.module, self.options
+        if function == 'lexical_analysis':
+            if options.get('mmap'):
+                return module.lex_file(self._write(code), language)
+            if options.get('parallel'):
+                return module.lexical_analysis(code, language, workers=options['parallel'])
+            return module.lexical_analysis(code, language)
+        if function == 'semantic_analysis_symbol_table':
+            if options.get('ast') and language == 'Python':
+                return module.semantic_analysis_symbol_table(code, language, engine='ast')
+            return module.semantic_analysis_symbol_table(code, language)
+        if function == 'remove_comments':
+            return module.remove_comments(code)
+
+        kwargs = {}
+        if function.startswith('analyze_code'):
+            if options.get('parallel'):
+                kwargs['workers'] = options['parallel']
+            if options.get('ast') and function == 'analyze_code_python':
+                kwargs['engine'] = 'ast'
+            return getattr(module, function)(code, **kwargs)
+
+        if options.get('incremental') and function == 'refactor_code_python':
+            kwargs['incremental'] = True
+        if options.get('edits'):
+            _, edits = getattr(module, function)(code, edits=True, **kwargs)
+            return '\n'.join(module.apply_edits(code.split('\n'), edits))
+        return getattr(module, function)(code, **kwargs)
+
+    def _write(self, code):
+        # lex_file() input; rewritten in place for every call
+        if self._temp is None:
+            handle, self._temp = tempfile.mkstemp(prefix='equivalence-', suffix='.src')
+            os.close(handle)
+        with open(self._temp, 'w', encoding='utf-8', newline='') as f:
+            f.write(code)
+        return self._temp
+
+    def close(self):
+        if self._temp is not None:
+            os.unlink(self._temp)
+
+
+def normalize(value):
+    """
+    Plain JSON-like data of an output (Issue records become dicts).
+    """
+    if hasattr(value, 'to_dict'):
+        return normalize(value.to_dict())
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if hasattr(value, '__next__'):
+        return [normalize(item) for item in value]
+    return value
+
+
+def project(reference, candidate):
+    """
+    The candidate output restricted to the keys present in the reference.
+    """
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        return {key: project(reference[key], candidate[key]) for key in reference if key in candidate}
+    if isinstance(reference, list) and isinstance(candidate, list) and len(reference) == len(candidate):
+        return [project(ref, cand) for ref, cand in zip(reference, candidate)]
+    return candidate
+
+
+def run(engine, function, code, language):
+    """
+    (normalized output or {'exception': type name}, seconds)
+    """
+    start = time.perf_counter()
+    try:
+        output = normalize(engine.call(function, code, language))
+    except Exception as e:
+        output = {'exception': type(e).__name__}
+    return output, time.perf_counter() - start
+
+
+def comparable(function, expected, actual, args):
+    """
+    The two outputs as compared: the candidate's projected on the
+    reference's keys (unless --strict), issue lists sorted if --unordered.
+    """
+    if not args.strict:
+        actual = project(expected, actual)
+    if args.unordered and function.startswith('analyze_code'):
+        if isinstance(expected, list) and isinstance(actual, list):
+            order = lambda issue: json.dumps(issue, sort_keys=True)
+            expected, actual = sorted(expected, key=order), sorted(actual, key=order)
+    return expected, actual
+
+
+def mismatch(reference, candidate, function, code, language, args):
+    """
+    (reference output, candidate output) when they differ on this input, else None.
+    """
+    expected, _ = run(reference, function, code, language)
+    actual, _ = run(candidate, function, code, language)
+    expected, actual = comparable(function, expected, actual, args)
+    return None if expected == actual else (expected, actual)
+
+
+def ddmin(items, fails, budget, deadline):
+    """
+    Delta debugging: a smaller sublist of items for which fails() still
+    holds, within a budget of fails() calls and a time.monotonic() deadline.
+    Returns (items, calls used).
+    """
+    calls = 0
+    granularity = 2
+    while len(items) >= 2 and calls < budget and time.monotonic() < deadline:
+        size = -(-len(items) // granularity)
+        reduced = False
+        for start in range(0, len(items), size):
+            complement = items[:start] + items[start + size:]
+            calls += 1
+            if fails(complement):
+                items = complement
+                granularity = max(granularity - 1, 2)
+                reduced = True
+                break
+            if calls >= budget or time.monotonic() >= deadline:
+                break
+        if not reduced:
+            if granularity >= len(items):
+                break
+            granularity = min(len(items), granularity * 2)
+    return items, calls
+
+
+def shrink(code, fails, budget, seconds):
+    """
+    Minimal (1-minimal within the budgets) input on which fails() still
+    holds: whole lines are removed first, then single characters.
+    """
+    deadline = time.monotonic() + seconds
+    lines, calls = ddmin(code.split('\n'), lambda lines: fails('\n'.join(lines)), budget, deadline)
+    code = '\n'.join(lines)
+    chars, more = ddmin(list(code), lambda chars: fails(''.join(chars)), budget - calls, deadline)
+    return ''.join(chars), calls + more
+
+
+def mutate(code, rng):
+    """
+    1-4 random edits: line deletion/duplication/swap/truncation, character
+    insertion/deletion, indentation and line-ending changes.
+    """
+    for _ in range(rng.randint(1, 4)):
+        lines = code.split('\n')
+        i, j = rng.randrange(len(lines)), rng.randrange(len(lines))
+        kind = rng.randrange(8)
+        if kind == 0 and len(lines) > 1:
+            del lines[i]
+        elif kind == 1:
+            lines.insert(i, lines[j])
+        elif kind == 2:
+            lines[i], lines[j] = lines[j], lines[i]
+        elif kind == 3:
+            lines[i] = lines[i][:rng.randint(0, len(lines[i]))]
+        elif kind == 4:
+            position = rng.randint(0, len(lines[i]))
+            lines[i] = lines[i][:position] + rng.choice(FUZZ_CHARS) + lines[i][position:]
+        elif kind == 5 and lines[i]:
+            position = rng.randrange(len(lines[i]))
+            lines[i] = lines[i][:position] + lines[i][position + 1:]
+        elif kind == 6:
+            lines[i] = rng.choice(('', '    ', '\t', '        ')) + lines[i].lstrip()
+        else:
+            lines[i] += '\r'
+        code = '\n'.join(lines)
+    return code
+
+
+def make_corpus(args):
+    """
+    [(language, kind, code)]: generated files, fuzzed mutations of them and
+    a few large generated files (for the parallel paths).
+    """
+    rng = random.Random(args.seed)
+    generated = []
+    for n in range(args.generated):
+        language = ('Python', 'C', 'C++')[n % 3]
+        pool = SNIPPETS[language] + (SNIPPETS['C'] if language == 'C++' else [])
+        generated.append((language, 'generated', ''.join(rng.choices(pool, k=rng.randint(1, 25)))))
+    corpus = list(generated)
+    for _ in range(args.fuzzed if generated else 0):
+        language, _, code = rng.choice(generated)
+        corpus.append((language, 'fuzzed', mutate(code, rng)))
+    for n in range(args.large * 3):
+        language = ('Python', 'C', 'C++')[n % 3]
+        pool = SNIPPETS[language] + (SNIPPETS['C'] if language == 'C++' else [])
+        code = ''
+        while code.count('\n') < args.large_lines:
+            code += ''.join(rng.choices(pool, k=50))
+        corpus.append((language, 'large', code))
+    return corpus
+
+
+def compare(reference, candidate, function, corpus, args):
+    """
+    Runs one function over the corpus on both engines; returns its report.
+    """
+    result = {'inputs': 0, 'mismatches': 0, 'reference_s': 0.0, 'candidate_s': 0.0, 'reproducers': []}
+    for language, kind, code in corpus:
+        if language not in FUNCTIONS[function]:
+            continue
+        expected, reference_s = run(reference, function, code, language)
+        actual, candidate_s = run(candidate, function, code, language)
+        for _ in range(args.repeat - 1):
+            reference_s = min(reference_s, run(reference, function, code, language)[1])
+            candidate_s = min(candidate_s, run(candidate, function, code, language)[1])
+        result['inputs'] += 1
+        result['reference_s'] += reference_s
+        result['candidate_s'] += candidate_s
+        expected, actual = comparable(function, expected, actual, args)
+        if expected == actual:
+            continue
+
+        result['mismatches'] += 1
+        if len(result['reproducers']) < args.max_reproducers:
+            fails = lambda text: mismatch(reference, candidate, function, text, language, args) is not None
+            small, calls = shrink(code, fails, args.shrink_budget, args.shrink_seconds)
+            expected, actual = mismatch(reference, candidate, function, small, language, args) or (expected, actual)
+            result['reproducers'].append({
+                'language': language,
+                'corpus': kind,
+                'input_lines': code.count('\n') + 1,
+                'shrink_calls': calls,
+                'code': small,
+                'reference': expected,
+                'candidate': actual,
+            })
+    result['speedup'] = round(result['reference_s'] / result['candidate_s'], 3) if result['candidate_s'] else None
+    result['reference_s'] = round(result['reference_s'], 4)
+    result['candidate_s'] = round(result['candidate_s'], 4)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reference', default='tree')
+    parser.add_argument('--candidate', default='tree+incremental+edits+mmap')
+    parser.add_argument('--functions', nargs='+', choices=list(FUNCTIONS), default=list(FUNCTIONS))
+    parser.add_argument('--generated', type=int, default=200, help='generated inputs')
+    parser.add_argument('--fuzzed', type=int, default=400, help='mutated copies of generated inputs')
+    parser.add_argument('--large', type=int, default=0, help='large generated inputs per language')
+    parser.add_argument('--large-lines', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=1, help='timing runs per input (the fastest counts)')
+    parser.add_argument('--strict', action='store_true', help='compare every key, not just the reference\'s')
+    parser.add_argument('--unordered', action='store_true', help='compare issue lists regardless of order')
+    parser.add_argument('--max-reproducers', type=int, default=3, help='shrunk reproducers per function')
+    parser.add_argument('--shrink-budget', type=int, default=2000, help='comparisons per shrink')
+    parser.add_argument('--shrink-seconds', type=float, default=60, help='time limit per shrink')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL) # the original analyzer logs every call
+    try:
+        reference, candidate = Engine(args.reference), Engine(args.candidate)
+    except ValueError as e:
+        parser.error(str(e))
+    corpus = make_corpus(args)
+
+    report = {'reference': args.reference, 'candidate': args.candidate, 'seed': args.seed,
+              'corpus': {kind: sum(1 for item in corpus if item[1] == kind) for kind in ('generated', 'fuzzed', 'large')},
+              'functions': {}, 'skipped': []}
+    try:
+        for function in args.functions:
+            if not (reference.supports(function) and candidate.supports(function)):
+                report['skipped'].append(function)
+                continue
+            report['functions'][function] = compare(reference, candidate, function, corpus, args)
+    finally:
+        reference.close()
+        candidate.close()
+    report['mismatches'] = sum(result['mismatches'] for result in report['functions'].values())
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if report['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
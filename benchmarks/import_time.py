@@ -0,0 +1,74 @@
+"""
+Startup benchmark for the shared analyzer package.
+
+Runs `python -X importtime -c "import analyzer"` in fresh interpreters and
+reports the cumulative import time of the package. Also checks that importing
+it has no side effects (no logging handlers installed, no regex compiled).
+
+Usage:
+    python benchmarks/import_time.py [--runs 10] [--budget-ms 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIDE_EFFECT_CHECK = """
+import sys
+import analyzer
+assert 're' not in sys.modules, "'re' loaded on import"
+assert not analyzer.patterns._compiled, 'regex compiled on import'
+assert not analyzer.lexer._token_regexes, 'lexer compiled on import'
+import logging
+assert not logging.root.handlers, 'analyzer configured logging on import'
+"""
+
+
+def measure_once():
+    """
+    Imports the package in a fresh interpreter and returns
+    (self_us, cumulative_us) for the top-level 'analyzer' entry.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import analyzer'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) == 3 and fields[2].strip() == 'analyzer':
+            return int(fields[0]), int(fields[1])
+    raise RuntimeError("'analyzer' not found in -X importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=15.0,
+                        help='fail if the median cumulative import time exceeds this')
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, '-c', SIDE_EFFECT_CHECK], cwd=REPO_ROOT, check=True)
+
+    samples = [measure_once() for _ in range(args.runs)]
+    cumulative_ms = [cum / 1000 for _, cum in samples]
+    report = {
+        'runs': args.runs,
+        'median_ms': round(statistics.median(cumulative_ms), 3),
+        'min_ms': round(min(cumulative_ms), 3),
+        'max_ms': round(max(cumulative_ms), 3),
+        'budget_ms': args.budget_ms,
+    }
+    print(json.dumps(report, indent=2))
+    if report['median_ms'] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
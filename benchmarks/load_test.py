@@ -0,0 +1,350 @@
+"""
+Load generator for the Flask endpoints (/analyze, /refactor, /remove_comments).
+
+Replays a corpus of C, C++ and Python payloads of mixed sizes against a
+server on localhost from --concurrency client threads and prints a JSON
+report: throughput, p50/p95/p99 latency and error rate, overall and per
+endpoint, language and payload size.
+
+Without --rate, every client sends its next request as soon as the previous
+one completes (closed loop: measures maximum throughput). With --rate, the
+requests are scheduled at that fixed total rate (open loop) and latency is
+measured from each request's scheduled start, so time spent queued behind a
+slow server counts (no coordinated omission); 'service_ms' is the time from
+actual send to response.
+
+The corpus is generated from built-in samples (--sizes, in lines) or read
+from a directory of .c/.cpp/.py files (--corpus). The server is either
+already running (--url) or started for the run (--launch threaded|prefork).
+
+Usage:
+    python benchmarks/load_test.py --launch prefork --server-workers 4 --concurrency 16 --duration 30
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --rate 50 --engine ast
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FLASK_DIR = os.path.join(REPO_ROOT, 'using_Flask')
+
+SAMPLES = {
+    'Python': '''import os, sys
+
+def ProcessData(data, items=[]):
+    global counter
+    total = 0
+    for item in items:
+        if item == True:
+            total += item / 2
+    print("total", total)  # running total
+    return total
+''',
+    'C': '''#include <stdio.h>
+/* process a buffer */
+int process(int n) {
+    int x;
+    char buf[16];
+    if (n = 0) { gets(buf); }
+    printf("%d %d\\n", n);
+    return x; // uninitialized
+}
+''',
+    'C++': '''#include <iostream>
+// raw pointer owner
+class Holder {
+public:
+    int *p = new int(5);
+    int get() { return *p / 1; }
+};
+''',
+}
+
+ENDPOINTS = ('analyze', 'refactor', 'remove_comments')
+
+
+def make_code(language, lines):
+    """
+    Repeats a language's sample until the file has about the given number of lines.
+    """
+    sample = SAMPLES[language]
+    return sample * max(1, lines // sample.count('\n'))
+
+
+def load_corpus(args):
+    """
+    [{'language', 'size', 'code'}] from --corpus or from the built-in samples.
+    """
+    if args.corpus:
+        sys.path.insert(0, REPO_ROOT)
+        from analyzer.files import iter_source_files, language_for, read_source
+        corpus = []
+        for path in iter_source_files(args.corpus):
+            code = read_source(path)
+            corpus.append({'language': language_for(path), 'size': code.count('\n') + 1, 'code': code})
+        if not corpus:
+            raise SystemExit(f"No C, C++ or Python files under {args.corpus}")
+        return corpus
+    return [{'language': language, 'size': lines, 'code': make_code(language, lines)}
+            for language in args.languages for lines in args.sizes]
+
+
+def parse_mix(text):
+    """
+    'analyze=6,refactor=2,remove_comments=2' -> {endpoint: weight}
+    """
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}' (valid: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def make_requests(corpus, args):
+    """
+    Deterministic (seeded) sequence of (endpoint, body, labels) to replay.
+    """
+    rng = random.Random(args.seed)
+    endpoints = list(args.mix)
+    weights = [args.mix[name] for name in endpoints]
+    requests = []
+    for _ in range(args.plan_size):
+        endpoint = rng.choices(endpoints, weights)[0]
+        item = rng.choice(corpus)
+        payload = {'code': item['code'], 'language': item['language']}
+        if endpoint == 'analyze':
+            payload['engine'] = args.engine
+            if args.fields:
+                payload['fields'] = args.fields
+            if args.workers:
+                payload['workers'] = args.workers
+        labels = {'endpoint': endpoint, 'language': item['language'], 'size': item['size']}
+        requests.append(('/' + endpoint, json.dumps(payload).encode('utf-8'), labels))
+    return requests
+
+
+def percentile(ordered, q):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples, elapsed):
+    """
+    Throughput, error rate and latency percentiles of [(latency_ms, service_ms, error)].
+    """
+    latencies = sorted(sample[0] for sample in samples if sample[2] is None)
+    errors = [sample[2] for sample in samples if sample[2] is not None]
+    result = {
+        'requests': len(samples),
+        'errors': len(errors),
+        'error_rate': round(len(errors) / len(samples), 4) if samples else 0.0,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'mean': round(statistics.fmean(latencies), 2) if latencies else None,
+            'max': latencies[-1] if latencies else None,
+        },
+    }
+    services = sorted(sample[1] for sample in samples if sample[2] is None)
+    if services != latencies:
+        result['service_ms'] = {'p50': percentile(services, 50), 'p95': percentile(services, 95),
+                                'p99': percentile(services, 99)}
+    if errors:
+        kinds = {}
+        for error in errors:
+            kinds[error] = kinds.get(error, 0) + 1
+        result['error_kinds'] = kinds
+    return result
+
+
+class LoadRun:
+    """
+    Sends the planned requests from several threads until the deadline and
+    records (labels, latency_ms, service_ms, error) per request.
+    """
+    def __init__(self, url, requests, args):
+        parsed = urllib.parse.urlsplit(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.requests = requests
+        self.args = args
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.samples = []
+
+    def _claim(self):
+        with self.lock:
+            index = self.next_index
+            self.next_index += 1
+        return index
+
+    def _send(self, path, body):
+        # One connection per request: the development server speaks HTTP/1.0
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.args.timeout)
+        try:
+            connection.request('POST', path, body, {'Content-Type': 'application/json',
+                                                    'Accept-Encoding': self.args.accept_encoding})
+            response = connection.getresponse()
+            response.read()
+            return None if response.status == 200 else f'HTTP {response.status}'
+        except (OSError, http.client.HTTPException) as e:
+            return type(e).__name__
+        finally:
+            connection.close()
+
+    def _client(self, start, deadline, record):
+        rate = self.args.rate
+        while True:
+            index = self._claim()
+            if self.args.requests and index >= self.args.requests:
+                return
+            scheduled = start + index / rate if rate else time.perf_counter()
+            if scheduled >= deadline:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            path, body, labels = self.requests[index % len(self.requests)]
+            sent = time.perf_counter()
+            if not rate:
+                scheduled = sent
+            error = self._send(path, body)
+            done = time.perf_counter()
+            if record:
+                sample = (labels, round((done - scheduled) * 1000, 2), round((done - sent) * 1000, 2), error)
+                with self.lock:
+                    self.samples.append(sample)
+
+    def run(self, seconds, record=True):
+        """
+        Runs the clients for the given time; returns the elapsed seconds.
+        """
+        self.next_index = 0
+        start = time.perf_counter()
+        deadline = start + seconds
+        threads = [threading.Thread(target=self._client, args=(start, deadline, record), daemon=True)
+                   for _ in range(self.args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+
+def launch(args):
+    """
+    Starts the app on a free local port; returns (process, url).
+    """
+    import socket
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    if args.launch == 'prefork':
+        command = [sys.executable, 'prefork.py', '--port', str(port), '--workers', str(args.server_workers)]
+    else:
+        command = [sys.executable, '-c', "import logging, app; logging.getLogger('werkzeug').setLevel(logging.ERROR); "
+                   f"app.app.run(port={port}, threaded=True, debug=False)"]
+    # The package may not be installed: import it from this checkout
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    process = subprocess.Popen(command, cwd=FLASK_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit('Server did not start within 30 s')
+
+
+def group(samples, key):
+    groups = {}
+    for labels, latency, service, error in samples:
+        groups.setdefault(key(labels), []).append((latency, service, error))
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', default='http://127.0.0.1:5000', help='running server to load')
+    target.add_argument('--launch', choices=('threaded', 'prefork'), help='start the app for the run')
+    parser.add_argument('--server-workers', type=int, default=os.cpu_count() or 2, help='prefork worker processes')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--rate', type=float, default=0, help='total requests per second (0: closed loop)')
+    parser.add_argument('--duration', type=float, default=20, help='measured seconds')
+    parser.add_argument('--requests', type=int, default=0, help='stop after this many requests')
+    parser.add_argument('--warmup', type=float, default=2, help='unmeasured seconds before the run')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('analyze=6,refactor=2,remove_comments=2'))
+    parser.add_argument('--languages', nargs='+', default=['Python', 'C', 'C++'], choices=['Python', 'C', 'C++'])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[50, 500, 5000], help='generated payload lines')
+    parser.add_argument('--corpus', help='directory of source files to replay instead of the generated ones')
+    parser.add_argument('--engine', choices=('lines', 'ast'), default='lines', help='/analyze engine')
+    parser.add_argument('--fields', help="/analyze fields, e.g. 'issues'")
+    parser.add_argument('--workers', type=int, help='/analyze intra-file workers')
+    parser.add_argument('--accept-encoding', default='gzip')
+    parser.add_argument('--plan-size', type=int, default=1000, help='distinct requests in the replay plan')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    requests = make_requests(corpus, args)
+    process = None
+    url = args.url
+    if args.launch:
+        process, url = launch(args)
+    try:
+        run = LoadRun(url, requests, args)
+        if args.warmup:
+            run.run(args.warmup, record=False)
+        elapsed = run.run(args.duration)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    samples = run.samples
+    report = {
+        'url': url,
+        'server': args.launch or 'external',
+        'server_workers': args.server_workers if args.launch == 'prefork' else None,
+        'concurrency': args.concurrency,
+        'rate': args.rate or None,
+        'engine': args.engine,
+        'duration_s': round(elapsed, 2),
+        'corpus': {'files': len(corpus), 'bytes': sum(len(item['code']) for item in corpus)},
+        'total': summarize([sample[1:] for sample in samples], elapsed),
+        'endpoints': {name: summarize(group_samples, elapsed)
+                      for name, group_samples in sorted(group(samples, lambda labels: labels['endpoint']).items())},
+        'languages': {name: summarize(group_samples, elapsed)
+                      for name, group_samples in sorted(group(samples, lambda labels: labels['language']).items())},
+        'sizes': {str(size): summarize(group_samples, elapsed)
+                  for size, group_samples in sorted(group(samples, lambda labels: labels['size']).items())},
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if report['total']['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
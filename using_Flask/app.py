@@ -1,59 +1,107 @@
-from flask import Flask, render_template, request, jsonify
-import analyzer
+from flask import Flask, render_template, request
+import logging
 import os
 
+import analyzer # installed from the repository root: pip install -e .
+import transport
+from coalesce import LatestWins, Superseded, request_key
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
 app = Flask(__name__)
 
+# Per-document latest-wins scheduling of /analyze requests
+analysis_queue = LatestWins()
+
+# Processes used by /analyze requests asking for parallel analysis
+SERVER_WORKERS = os.cpu_count() or 1
+
+# Shared by all request threads; its tables are built here, at startup, so
+# prefork.py workers inherit them from the parent
+code_analyzer = analyzer.Analyzer()
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    data = request.json
+    data = transport.read_json(request)
     code = data.get('code', '')
     language = data.get('language', 'Python')
+    engine = data.get('engine', 'lines') # Python only: 'ast' for the single-walk engine
+    
+    # 'fields' (list or comma-separated) selects the results; only the phases
+    # they need are run, e.g. ["issues"] never lexes or builds the symbol table
+    try:
+        fields = analyzer.parse_fields(data.get('fields'))
+        # 'workers' > 1 analyzes large files in parallel chunks; the server
+        # picks the process count, so all requests share one pool
+        workers = analyzer.parse_workers(data.get('workers')) and SERVER_WORKERS
+        # 'rules': {"disable": [...], "options": {"max_line_length": 100}}
+        rules = analyzer.rule_set(data.get('rules'))
+    except ValueError as e:
+        return transport.json_response({'error': str(e)}, request, status=400)
+    token_format = data.get('token_format')
+    # 'token_format': 'summary' sends 'token_summary' (counts by type, tokens
+    # per line, most frequent identifiers) instead of the token list; the
+    # tokens are counted while lexing and never held in memory
+    if token_format == 'summary':
+        fields = tuple('token_summary' if field == 'tokens' else field for field in fields)
     
-    # Phase 1: Lexical
-    tokens = analyzer.lexical_analysis(code, language)
+    def compute():
+        results = code_analyzer.analyze(code, language, fields=fields, engine=engine, workers=workers, rules=rules)
+        if 'issues' in results:
+            results['issues'] = analyzer.issues_to_dicts(results['issues']) # messages are formatted here
+        # 'token_format': 'columns' sends {'type': [...], 'value': [...], 'line': [...]}
+        if 'tokens' in results and token_format == 'columns':
+            results['tokens'] = transport.columnar_tokens(results['tokens'])
+        return results
     
-    # Phase 2 & 3: Syntax/Semantic
-    if language == "C":
-        issues = analyzer.analyze_code(code)
-        symbol_table = analyzer.semantic_analysis_symbol_table(code, language)
-    elif language == "C++":
-        issues = analyzer.analyze_code_cpp(code)
-        symbol_table = analyzer.semantic_analysis_symbol_table(code, language)
-    else: # Python
-        issues = analyzer.analyze_code_python(code)
-        symbol_table = analyzer.semantic_analysis_symbol_table(code, language)
+    # With a 'document_id', stale requests for the document are dropped when a
+    # newer one arrives, and unchanged code reuses the last result
+    document_id = data.get('document_id')
+    if document_id is None:
+        results = compute()
+    else:
+        key = request_key(code, language, fields, engine, workers, token_format, rules.key)
+        try:
+            results = analysis_queue.run(str(document_id), key, compute)
+        except Superseded:
+            return transport.json_response({'error': 'Superseded by a newer request', 'superseded': True}, request, status=409)
         
-    return jsonify({
-        'tokens': tokens,
-        'issues': issues,
-        'symbol_table': symbol_table
-    })
+    # Compressed (gzip/zstd) when the client accepts it
+    return transport.json_response(results, request)
 
 @app.route('/refactor', methods=['POST'])
 def refactor():
-    data = request.json
+    data = transport.read_json(request)
     code = data.get('code', '')
     language = data.get('language', 'Python')
     
+    # 'edits': true returns only the changed line ranges instead of the whole file
+    if data.get('edits'):
+        if language == "C" or language == "C++":
+            _, edits = analyzer.refactor_code(code, edits=True)
+        else:
+            _, edits = analyzer.refactor_code_python(code, edits=True, incremental=True)
+        return transport.json_response({'edits': edits}, request)
+    
     if language == "C" or language == "C++":
         refactored = analyzer.refactor_code(code)
     else:
-        refactored = analyzer.refactor_code_python(code)
+        refactored = analyzer.refactor_code_python(code, incremental=True)
         
-    return jsonify({'refactored_code': refactored})
+    return transport.json_response({'refactored_code': refactored}, request)
 
 @app.route('/remove_comments', methods=['POST'])
 def remove_comments():
-    data = request.json
+    data = transport.read_json(request)
     code = data.get('code', '')
     
     cleaned = analyzer.remove_comments(code)
-    return jsonify({'cleaned_code': cleaned})
+    return transport.json_response({'cleaned_code': cleaned}, request)
 
 if __name__ == '__main__':
     app.run(debug=True)
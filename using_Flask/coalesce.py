@@ -0,0 +1,78 @@
+"""
+Latest-wins coalescing of analysis requests per document.
+
+The front end sends a 'document_id' with each /analyze request. Requests
+for the same document are run one at a time; when a newer request for the
+document arrives, the older ones still waiting for their turn are dropped
+(they raise Superseded) instead of being computed. The last result of each
+document is kept, so re-analyzing unchanged content returns it directly.
+
+A burst of N clicks therefore costs at most the analysis already running
+plus the latest one, and a single analysis when the code did not change.
+An analysis that has already started is not interrupted.
+"""
+import hashlib
+import threading
+
+# Documents whose state is kept (least recently used are forgotten first)
+MAX_DOCUMENTS = 256
+
+
+class Superseded(Exception):
+    """
+    A newer request for the same document arrived before this one ran.
+    """
+
+
+class _Document:
+    __slots__ = ('lock', 'latest', 'result_key', 'result')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = 0
+        self.result_key = None
+        self.result = None
+
+
+class LatestWins:
+    """
+    Per-document serialization with dropping of stale requests.
+    """
+    def __init__(self, max_documents=MAX_DOCUMENTS):
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._documents = {}
+
+    def _enter(self, document_id):
+        # Returns the document state and the ticket of this request
+        with self._lock:
+            document = self._documents.pop(document_id, None) or _Document()
+            self._documents[document_id] = document # most recently used last
+            if len(self._documents) > self.max_documents:
+                del self._documents[next(iter(self._documents))]
+            document.latest += 1
+            return document, document.latest
+
+    def run(self, document_id, key, compute):
+        """
+        Returns compute() for the latest request of a document, or the cached
+        result when key matches the last computed one. Raises Superseded if a
+        newer request arrived while this one was waiting.
+        """
+        document, ticket = self._enter(document_id)
+        with document.lock:
+            if ticket != document.latest:
+                raise Superseded(document_id)
+            if key == document.result_key:
+                return document.result
+            result = compute()
+            document.result_key, document.result = key, result
+            return result
+
+
+def request_key(code, *options):
+    """
+    Cache key of a request: digest of the code plus the options that shape
+    the result.
+    """
+    return (hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),) + options
@@ -0,0 +1,180 @@
+"""
+Pre-fork multi-worker launcher for the Flask app (POSIX only).
+
+The parent opens the listening socket, imports the app (which builds the
+shared analyzer's regexes, lexer tables and rule pipelines) and freezes the
+result, then forks the workers; they accept on the inherited socket and
+share the preloaded state copy-on-write. Workers that die are respawned.
+
+The parent prints a JSON line with the memory of each worker, read from
+/proc/<pid>/smaps_rollup: rss_kb (resident), pss_kb (proportional: shared
+pages divided between the processes sharing them), shared_kb and
+private_kb (pages copied into, or allocated by, that worker alone). It
+prints one a few seconds after startup, then every --report-every seconds
+and on SIGUSR1. Run once with --no-preload (every worker imports and warms
+the app itself) to see what preloading saves.
+
+Usage:
+    python prefork.py [--workers 4] [--host 127.0.0.1] [--port 5000]
+                      [--no-preload] [--report-every SECONDS]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import time
+
+# First report, once the workers have started
+FIRST_REPORT_DELAY = 3.0
+
+
+def memory(pid):
+    """
+    {'rss_kb', 'pss_kb', 'shared_kb', 'private_kb'} of a process, or None if
+    it is gone. Falls back to VmRSS alone when smaps_rollup is unavailable.
+    """
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except FileNotFoundError:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return {'rss_kb': int(line.split()[1])}
+        except OSError:
+            pass
+        return None
+    except OSError:
+        return None
+    return {
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'private_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def report(workers, preload):
+    """
+    Prints the memory of the parent and of each worker as one JSON line.
+    """
+    rows = []
+    for index, pid in sorted(workers.items()):
+        usage = memory(pid)
+        if usage is not None:
+            rows.append(dict(worker=index, pid=pid, **usage))
+    totals = {key: sum(row.get(key, 0) for row in rows) for key in ('rss_kb', 'pss_kb', 'private_kb')}
+    print(json.dumps({
+        'time': round(time.time(), 3),
+        'preload': preload,
+        'parent': memory(os.getpid()),
+        'workers': rows,
+        'total': totals,
+    }), flush=True)
+
+
+def _serve(sock, args):
+    # Runs in a forked worker; never returns
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    status = 0
+    try:
+        from werkzeug.serving import make_server
+        from app import app # already imported (and warmed) by the parent when preloading
+        server = make_server(args.host, args.port, app, threaded=True, fd=sock.fileno())
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        status = 1
+    finally:
+        os._exit(status)
+
+
+def _spawn(sock, args):
+    pid = os.fork()
+    if pid == 0:
+        _serve(sock, args)
+    return pid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        help='import and warm the app in each worker instead of the parent')
+    parser.add_argument('--report-every', type=float, default=0,
+                        help='seconds between memory reports (default: only after startup and on SIGUSR1)')
+    args = parser.parse_args(argv)
+    if not hasattr(os, 'fork'):
+        parser.error('prefork.py needs os.fork (POSIX); use "python app.py" instead')
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(128)
+
+    if args.preload:
+        import app
+        app.code_analyzer.prefork()
+
+    stopping = []
+    wanted = [time.monotonic() + FIRST_REPORT_DELAY]
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGUSR1, lambda *_: wanted.append(0))
+
+    workers = {index: _spawn(sock, args) for index in range(args.workers)}
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers "
+          f"({'preloaded' if args.preload else 'no preload'}), parent pid {os.getpid()}", file=sys.stderr, flush=True)
+
+    try:
+        while not stopping:
+            time.sleep(0.2)
+            # Respawn workers that exited
+            while True:
+                try:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if not pid:
+                    break
+                for index, worker_pid in list(workers.items()):
+                    if worker_pid == pid and not stopping:
+                        print(f"Worker {index} (pid {pid}) exited, respawning", file=sys.stderr, flush=True)
+                        workers[index] = _spawn(sock, args)
+            now = time.monotonic()
+            if any(due <= now for due in wanted):
+                wanted[:] = [due for due in wanted if due > now]
+                if args.report_every > 0 and not wanted:
+                    wanted.append(now + args.report_every)
+                report(workers, args.preload)
+    finally:
+        for pid in workers.values():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers.values():
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        sock.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -50,41 +50,57 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // Analyze Action
-    analyzeBtn.addEventListener('click', async () => {
+    // Repeated clicks are debounced, and a new analysis aborts the one in
+    // flight; the document id lets the server drop its queued stale requests
+    const documentId = (crypto.randomUUID && crypto.randomUUID()) || Math.random().toString(36).slice(2);
+    const ANALYZE_DEBOUNCE_MS = 150;
+    let analyzeTimer = null;
+    let analyzeController = null;
+
+    analyzeBtn.addEventListener('click', () => {
         analyzeBtn.innerText = "⏳ Compiling...";
+        clearTimeout(analyzeTimer);
+        analyzeTimer = setTimeout(runAnalysis, ANALYZE_DEBOUNCE_MS);
+    });
+
+    async function runAnalysis() {
+        if (analyzeController) analyzeController.abort();
+        const controller = analyzeController = new AbortController();
         try {
-            const response = await fetch('/analyze', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    code: codeEditor.value,
-                    language: langSelect.value
-                })
+            const options = await jsonRequest({
+                code: codeEditor.value,
+                language: langSelect.value,
+                document_id: documentId,
+                token_format: 'columns' // One array per field, smaller than one object per token
             });
+            const response = await fetch('/analyze', { ...options, signal: controller.signal });
+            if (response.status === 409) return; // Superseded by a newer click
             const data = await response.json();
             renderResults(data);
         } catch (e) {
+            if (e.name === 'AbortError') return;
             console.error(e);
             alert("Analysis failed!");
         } finally {
-            analyzeBtn.innerText = "▶️ Start Compilation";
+            if (controller === analyzeController) {
+                analyzeController = null;
+                analyzeBtn.innerText = "▶️ Start Compilation";
+            }
         }
-    });
+    }
 
     // Refactor Action
     refactorBtn.addEventListener('click', async () => {
         refactorBtn.innerText = "⏳ Processing...";
         try {
-            const response = await fetch('/refactor', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    code: codeEditor.value,
-                    language: langSelect.value
-                })
-            });
+            const source = codeEditor.value;
+            const response = await fetch('/refactor', await jsonRequest({
+                code: source,
+                language: langSelect.value,
+                edits: true // Only the changed line ranges come back
+            }));
             const data = await response.json();
-            showModal(data.refactored_code);
+            showModal(applyEdits(source, data.edits));
         } catch (e) {
             alert("Refactoring failed!");
         } finally {
@@ -103,14 +119,35 @@ document.addEventListener('DOMContentLoaded', () => {
         showModal(data.cleaned_code);
     });
 
+    // POST options for a JSON body, gzip-compressed when large and the browser supports it
+    const COMPRESS_MIN_BYTES = 64 * 1024;
+    async function jsonRequest(payload) {
+        const body = JSON.stringify(payload);
+        if (body.length < COMPRESS_MIN_BYTES || typeof CompressionStream === 'undefined') {
+            return { method: 'POST', headers: { 'Content-Type': 'application/json' }, body };
+        }
+        const stream = new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'));
+        return {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+            body: await new Response(stream).blob()
+        };
+    }
+
     // Rendering Logic
+    // Token and symbol tables are virtualized: only the rows in view (plus a
+    // margin) exist in the DOM, so large results render in constant time.
+    const tokenView = virtualTable(tokensTable, 3);
+    const symbolView = virtualTable(symbolTable, 4);
+    const ISSUE_BATCH = 200;
+    let renderGeneration = 0;
+
     function renderResults(data) {
-        // 1. Tokens
-        tokensTable.innerHTML = '';
-        data.tokens.forEach(t => {
-            const row = `<tr><td>${t.type}</td><td>${t.value}</td><td>${t.line}</td></tr>`;
-            tokensTable.innerHTML += row;
-        });
+        const generation = ++renderGeneration;
+
+        // 1. Issues first, shown as soon as they are ready
+        renderIssues(data.issues, generation);
+        document.querySelector('[data-tab="errors"]').click();
 
         // 2. Syntax Status
         const syntaxErrors = data.issues.filter(i => i.type === 'Syntax Error');
@@ -122,32 +159,136 @@ document.addEventListener('DOMContentLoaded', () => {
             syntaxStatus.innerText = '❌ Syntax Errors Detected';
         }
 
-        // 3. Symbol Table
-        symbolTable.innerHTML = '';
-        data.symbol_table.forEach(s => {
-            const row = `<tr><td>${s.name}</td><td>${s.type}</td><td>${s.scope}</td><td>${s.line}</td></tr>`;
-            symbolTable.innerHTML += row;
-        });
+        // 3. Tokens (columnar: {type: [...], value: [...], line: [...]})
+        const tokens = data.tokens;
+        tokenView.setRows(tokens.line.length, k => [tokens.type[k], tokens.value[k], tokens.line[k]]);
 
-        // 4. Issues
-        issuesList.innerHTML = '';
-        if (data.issues.length === 0) {
-            issuesList.innerHTML = '<div class="issue-card info">No issues detected!</div>';
-        } else {
-            data.issues.forEach(i => {
+        // 4. Symbol Table
+        const symbols = data.symbol_table;
+        symbolView.setRows(symbols.length, k => [symbols[k].name, symbols[k].type, symbols[k].scope, symbols[k].line]);
+    }
+
+    // Issue cards have variable heights, so they are appended in batches
+    // through a fragment, one batch per frame, instead of virtualized
+    function renderIssues(issues, generation) {
+        issuesList.textContent = '';
+        if (issues.length === 0) {
+            issuesList.appendChild(issueCard('info', 'No issues detected!'));
+            return;
+        }
+        let next = 0;
+        const appendBatch = () => {
+            if (generation !== renderGeneration) return; // A newer result replaced this one
+            const fragment = document.createDocumentFragment();
+            const end = Math.min(next + ISSUE_BATCH, issues.length);
+            for (; next < end; next++) {
+                const i = issues[next];
                 let typeClass = 'info';
                 if (i.type.includes('Error') || i.type === 'Bug') typeClass = 'error';
                 else if (i.type.includes('Warning') || i.type.includes('Risk')) typeClass = 'warning';
-                
-                const card = `<div class="issue-card ${typeClass}">
-                    <strong>[Line ${i.line}] ${i.type}:</strong> ${i.message}
-                </div>`;
-                issuesList.innerHTML += card;
-            });
+                const card = issueCard(typeClass, ' ' + i.message);
+                const title = document.createElement('strong');
+                title.textContent = `[Line ${i.line}] ${i.type}:`;
+                card.prepend(title);
+                fragment.appendChild(card);
+            }
+            issuesList.appendChild(fragment);
+            if (next < issues.length) requestAnimationFrame(appendBatch);
+        };
+        appendBatch();
+    }
+
+    function issueCard(typeClass, text) {
+        const card = document.createElement('div');
+        card.className = `issue-card ${typeClass}`;
+        card.textContent = text;
+        return card;
+    }
+
+    // Table body showing rows [first, last) of a row source between two
+    // spacer rows that keep the scrollbar the size of the full table
+    function virtualTable(tbody, columns) {
+        const OVERSCAN = 20;
+        const FALLBACK_ROW_HEIGHT = 39;
+        const scroller = tbody.closest('.table-wrapper');
+        const rowTemplate = document.createElement('tr');
+        for (let c = 0; c < columns; c++) rowTemplate.appendChild(document.createElement('td'));
+
+        let count = 0;
+        let cells = null;
+        let rowHeight = 0;
+        let pending = false;
+
+        function spacer(height) {
+            const row = document.createElement('tr');
+            const cell = document.createElement('td');
+            cell.colSpan = columns;
+            cell.style.cssText = `height:${height}px;padding:0;border:none`;
+            row.appendChild(cell);
+            return row;
+        }
+
+        function render() {
+            pending = false;
+            if (!cells) return;
+            const height = rowHeight || FALLBACK_ROW_HEIGHT;
+            // Hidden tabs have no height yet; render a first screenful anyway
+            const viewport = scroller.clientHeight || 20 * height;
+            const first = Math.max(0, Math.floor(scroller.scrollTop / height) - OVERSCAN);
+            const last = Math.min(count, first + Math.ceil(viewport / height) + 2 * OVERSCAN);
+
+            const fragment = document.createDocumentFragment();
+            fragment.appendChild(spacer(first * height));
+            for (let k = first; k < last; k++) {
+                const row = rowTemplate.cloneNode(true);
+                const values = cells(k);
+                for (let c = 0; c < columns; c++) row.children[c].textContent = values[c];
+                fragment.appendChild(row);
+            }
+            fragment.appendChild(spacer((count - last) * height));
+            tbody.replaceChildren(fragment);
+
+            if (!rowHeight && last > first && tbody.children[1].offsetHeight) {
+                rowHeight = tbody.children[1].offsetHeight; // Measured once the tab is visible
+                render();
+            }
+        }
+
+        function schedule() {
+            if (!pending) {
+                pending = true;
+                requestAnimationFrame(render);
+            }
+        }
+
+        scroller.addEventListener('scroll', schedule, { passive: true });
+        // Tables rendered while their tab was hidden are refreshed when it is shown
+        document.querySelector(`[data-tab="${scroller.closest('.tab-content').id}"]`)
+            .addEventListener('click', schedule);
+
+        return {
+            setRows(rowCount, rowCells) {
+                count = rowCount;
+                cells = rowCells;
+                scroller.scrollTop = 0;
+                render();
+            }
+        };
+    }
+
+    // Applies /refactor line-range edits (sorted, 1-based, inclusive) to the source
+    // in one forward pass (no spread: an edit can hold more lines than the stack allows)
+    function applyEdits(source, edits) {
+        const lines = source.split('\n');
+        const out = [];
+        let next = 0; // First source line (0-based) not copied or replaced yet
+        for (const e of edits) {
+            for (; next < e.start - 1; next++) out.push(lines[next]);
+            for (const line of e.lines) out.push(line);
+            next = e.end;
         }
-        
-        // Switch to Lexical tab to show something happened
-        document.querySelector('[data-tab="lexical"]').click();
+        for (; next < lines.length; next++) out.push(lines[next]);
+        return out.join('\n');
     }
 
     // Modal Logic
@@ -0,0 +1,148 @@
+"""
+Request/response encoding for the Flask app.
+
+- Request bodies may be sent with 'Content-Encoding: gzip' (or 'zstd');
+  they are decompressed incrementally and rejected with 413 once they grow
+  past the app's MAX_CONTENT_LENGTH (MAX_DECODED_BYTES if it is unset).
+- Responses are compressed with the best encoding the client accepts
+  (zstd if the 'zstandard' package is installed, else gzip) once they are
+  large enough for it to pay off.
+- JSON is encoded with 'orjson' when it is installed, else with the standard
+  library in compact form.
+"""
+import gzip
+import io
+import json
+import zlib
+
+from flask import Response, abort
+
+# Smaller bodies are sent as they are, compression would not pay off
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+# Cap on a decompressed request body when the app sets no MAX_CONTENT_LENGTH
+MAX_DECODED_BYTES = 16 * 1024 * 1024
+# Decompressed bytes read per step
+DECODE_CHUNK = 64 * 1024
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Invalid JSON, unknown encoding or corrupt compressed data
+DECODE_ERRORS = (ValueError, OSError, EOFError, zlib.error)
+if zstandard is not None:
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def dumps(payload):
+    """
+    Encodes a payload to UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(body):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class _TooLarge(Exception):
+    pass
+
+
+def _read_capped(stream, limit):
+    # Reads a decompressing stream to the end, stopping past limit bytes
+    chunks = []
+    size = 0
+    while True:
+        chunk = stream.read(DECODE_CHUNK)
+        if not chunk:
+            return b''.join(chunks)
+        size += len(chunk)
+        if size > limit:
+            raise _TooLarge()
+        chunks.append(chunk)
+
+
+def _decode(body, encoding, limit):
+    # Undoes the Content-Encoding of a request body
+    encoding = encoding.strip().lower()
+    if encoding in ('', 'identity'):
+        return body
+    if encoding == 'gzip':
+        with gzip.GzipFile(fileobj=io.BytesIO(body)) as stream:
+            return _read_capped(stream, limit)
+    if encoding == 'zstd' and zstandard is not None:
+        with zstandard.ZstdDecompressor().stream_reader(body) as stream:
+            return _read_capped(stream, limit)
+    raise ValueError(f"Unsupported Content-Encoding '{encoding}'")
+
+
+def read_json(request):
+    """
+    Returns the JSON body of a request, decompressing it first if needed.
+    """
+    limit = request.max_content_length or MAX_DECODED_BYTES
+    try:
+        body = _decode(request.get_data(cache=False), request.headers.get('Content-Encoding', ''), limit)
+        return loads(body) if body else {}
+    except _TooLarge:
+        abort(413, description=f"Decompressed request body exceeds {limit} bytes")
+    except DECODE_ERRORS as e:
+        abort(400, description=f"Malformed request body: {e}")
+
+
+def _accepted(request):
+    # Encodings listed in Accept-Encoding without q=0
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def json_response(payload, request, status=200):
+    """
+    Serializes a payload and compresses it with the preferred encoding the
+    client accepts.
+    """
+    body = dumps(payload)
+    response = Response(status=status, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+
+    if len(body) >= MIN_COMPRESS_BYTES:
+        accepted = _accepted(request)
+        if zstandard is not None and 'zstd' in accepted:
+            body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+            response.headers['Content-Encoding'] = 'zstd'
+        elif 'gzip' in accepted:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            response.headers['Content-Encoding'] = 'gzip'
+
+    response.set_data(body)
+    return response
+
+
+def columnar_tokens(tokens):
+    """
+    Compact token shape: one array per field instead of one object per token,
+    {'type': [...], 'value': [...], 'line': [...]}.
+    """
+    return {
+        'type': [token['type'] for token in tokens],
+        'value': [token['value'] for token in tokens],
+        'line': [token['line'] for token in tokens],
+    }
@@ -1,7 +1,9 @@
 import streamlit as st
-import analyzer
+import pandas as pd
 import time
 
+import analyzer # installed from the repository root: pip install -e .
+
 # Page Configuration
 st.set_page_config(
     page_title="Code Audit & Refactor Tool",
@@ -56,6 +58,8 @@ with st.sidebar:
         st.info("Mode: C++ Analysis (Enhanced)")
     elif language == "Python":
         st.info("Mode: Python Analysis (PEP 8)")
+        engine = st.radio("Analysis Engine", ["lines", "ast"], horizontal=True,
+                          help="'ast' parses once and runs all rules in a single tree walk (falls back to 'lines' on syntax errors).")
 
     st.markdown("---")
     st.markdown("### 🔍 Compiler Phases")
@@ -139,6 +143,60 @@ with col2:
 with col3:
     remove_comments_btn = st.button("🗑️ Remove Comments", width="stretch")
     
+# Table paging helpers
+PAGE_SIZES = [100, 500, 1000, 5000]
+
+def build_frame(records, columns):
+    """
+    Builds a columnar frame once from a list of dicts (one array per column).
+    """
+    data = {col: [] for col in columns}
+    for record in records:
+        for col in columns:
+            data[col].append(record[col])
+    return pd.DataFrame(data, columns=list(columns))
+
+def render_paged_table(frame, key, filter_col):
+    """
+    Renders a server-side filtered and paginated view of a columnar frame.
+    Only the current page is sent to the browser.
+    """
+    if frame.empty:
+        st.info("Nothing to show.")
+        return
+
+    f1, f2, f3, f4 = st.columns([3, 1, 1, 2])
+    with f1:
+        kinds = sorted(frame[filter_col].unique())
+        selected = st.multiselect(f"Filter by {filter_col}", kinds, key=f"{key}_kinds")
+    min_line, max_line = int(frame['line'].min()), int(frame['line'].max())
+    with f2:
+        line_from = st.number_input("From line", min_line, max_line, min_line, key=f"{key}_from")
+    with f3:
+        line_to = st.number_input("To line", min_line, max_line, max_line, key=f"{key}_to")
+    with f4:
+        search = st.text_input("Value/Name contains", key=f"{key}_search")
+
+    # Vectorized filtering over the whole columns
+    mask = frame['line'].between(line_from, line_to)
+    if selected:
+        mask &= frame[filter_col].isin(selected)
+    if search:
+        text_col = 'value' if 'value' in frame.columns else 'name'
+        mask &= frame[text_col].astype(str).str.contains(search, regex=False)
+    view = frame[mask]
+
+    p1, p2 = st.columns([1, 3])
+    with p1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, -(-len(view) // page_size))
+    with p2:
+        page = st.number_input(f"Page (of {pages})", 1, pages, 1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    st.caption(f"Showing rows {start + 1 if len(view) else 0}-{min(start + page_size, len(view))} of {len(view)} (filtered from {len(frame)})")
+    st.dataframe(view.iloc[start:start + page_size], width="stretch", hide_index=True)
+
 # LOGIC
 if compile_btn:
     with st.spinner("Running Compiler Phases..."):
@@ -155,53 +213,76 @@ if compile_btn:
             issues = analyzer.analyze_code_cpp(code_input)
             symbol_table = analyzer.semantic_analysis_symbol_table(code_input, language)
         else: # Python
-            issues = analyzer.analyze_code_python(code_input)
-            symbol_table = analyzer.semantic_analysis_symbol_table(code_input, language)
+            # One analysis, so the 'ast' engine parses the code only once
+            results = analyzer.analyze(code_input, language, fields=('issues', 'symbol_table'), engine=engine)
+            issues, symbol_table = results['issues'], results['symbol_table']
+
+        # Reset paging/filter widgets, their bounds depend on the new results
+        for widget_key in [k for k in st.session_state if k.startswith(('tokens_', 'symbols_'))]:
+            del st.session_state[widget_key]
+
+        # Build the frames once; paging/filter widgets rerun the script and reuse them
+        st.session_state['results'] = {
+            'tokens': build_frame(tokens, ('type', 'value', 'line')),
+            'symbols': build_frame(symbol_table, ('name', 'type', 'scope', 'line')),
+            'issues': issues,
+            'issue_groups': analyzer.group_issues(issues), # categories are precomputed per rule
+        }
+
+results = st.session_state.get('results')
+if results:
+    token_frame = results['tokens']
+    symbol_frame = results['symbols']
+    issues = results['issues']
+    groups = results['issue_groups']
+
+    # TABS for phases
+    tab1, tab2, tab3, tab4 = st.tabs(["📝 Lexical Analysis", "🏗️ Syntax/Semantic", "📊 Symbol Table", "❌ Errors/Warnings"])
+    
+    with tab1:
+        st.subheader("Token Stream (Lexer)")
+        # Summary first, so huge inputs are usable before paging through rows
+        counts = token_frame['type'].value_counts()
+        st.markdown(f"**{len(token_frame)} tokens** — " + ", ".join(f"{kind}: {n}" for kind, n in counts.items()))
+        render_paged_table(token_frame, 'tokens', 'type')
         
-        # TABS for phases
-        tab1, tab2, tab3, tab4 = st.tabs(["📝 Lexical Analysis", "🏗️ Syntax/Semantic", "📊 Symbol Table", "❌ Errors/Warnings"])
+    with tab2:
+        st.subheader("Structure Validation")
+        if not groups[analyzer.SYNTAX]:
+            st.success("✅ Syntax Valid (No Structural Errors)")
+        else:
+            st.error("❌ Syntax Errors Detected")
+            
+    with tab3:
+        st.subheader("Symbol Table (Semantic)")
+        render_paged_table(symbol_frame, 'symbols', 'type')
         
-        with tab1:
-            st.subheader("Token Stream (Lexer)")
-            st.dataframe(tokens, width="stretch")
+    with tab4:
+        st.subheader("Analysis Report")
+        if issues:
+            # Categorize for display
+            synt_err = groups[analyzer.SYNTAX]
+            sem_err = groups[analyzer.SEMANTIC]
+            run_risk = groups[analyzer.RUNTIME]
+            lints = groups[analyzer.LINT]
             
-        with tab2:
-            st.subheader("Structure Validation")
-            if not any(i['type'] == 'Syntax Error' for i in issues):
-                st.success("✅ Syntax Valid (No Structural Errors)")
-            else:
-                st.error("❌ Syntax Errors Detected")
+            if synt_err:
+                st.error(f"Syntax Errors ({len(synt_err)})")
+                for i in synt_err: st.write(f"- Line {i.line}: {i.message}")
                 
-        with tab3:
-            st.subheader("Symbol Table (Semantic)")
-            st.dataframe(symbol_table, width="stretch")
-            
-        with tab4:
-            st.subheader("Analysis Report")
-            if issues:
-                # Categorize for display
-                synt_err = [i for i in issues if i['type'] == 'Syntax Error']
-                sem_err = [i for i in issues if i['type'] == 'Semantic Error' or i['type'] == 'Dead Code' or i['type'] == 'Logic Error']
-                run_risk = [i for i in issues if i['type'] == 'Runtime Risk' or i['type'] == 'Infinite Loop' or i['type'] == 'Math Error']
-                lints = [i for i in issues if 'Lint' in i['type'] or 'Suggestion' in i['type'] or 'Style' in i['type']]
+            if sem_err:
+                st.warning(f"Semantic/Logic Errors ({len(sem_err)})")
+                for i in sem_err: st.write(f"- Line {i.line}: {i.message}")
+                
+            if run_risk:
+                st.warning(f"Runtime Risks ({len(run_risk)})")
+                for i in run_risk: st.write(f"- Line {i.line}: {i.message}")
                 
-                if synt_err:
-                    st.error(f"Syntax Errors ({len(synt_err)})")
-                    for i in synt_err: st.write(f"- Line {i['line']}: {i['message']}")
-                    
-                if sem_err:
-                    st.warning(f"Semantic/Logic Errors ({len(sem_err)})")
-                    for i in sem_err: st.write(f"- Line {i['line']}: {i['message']}")
-                    
-                if run_risk:
-                    st.warning(f"Runtime Risks ({len(run_risk)})")
-                    for i in run_risk: st.write(f"- Line {i['line']}: {i['message']}")
-                    
-                if lints:
-                    st.info(f"Lint Warnings / Optimization ({len(lints)})")
-                    for i in lints: st.write(f"- Line {i['line']}: {i['message']}")
-            else:
-                st.success("No issues detected!")
+            if lints:
+                st.info(f"Lint Warnings / Optimization ({len(lints)})")
+                for i in lints: st.write(f"- Line {i.line}: {i.message}")
+        else:
+            st.success("No issues detected!")
 
 if refactor_btn:
      st.subheader("Optimized Code (Refactoring)")
@@ -210,7 +291,7 @@ if refactor_btn:
          refactored = analyzer.refactor_code(code_input)
          st.code(refactored, language='c')
      else:
-         refactored = analyzer.refactor_code_python(code_input)
+         refactored = analyzer.refactor_code_python(code_input, incremental=True)
          st.code(refactored, language='python')
      st.success("Code Refactored & Optimized!")
      